@@ -0,0 +1,77 @@
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CorpusConfig, generate_corpus
+from async_convert import AsyncConverter
+from convert import convert
+
+
+async def ticker(lags, interval=0.005):
+    # How late the event loop wakes a sleeping task: what every other
+    # request served by the app would wait on top of its own work.
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - expected)
+
+
+async def serve(requests, handle, concurrency):
+    latencies = []
+    queue = list(requests)
+
+    async def client():
+        while queue:
+            markdown = queue.pop()
+            started = time.perf_counter()
+            await handle(markdown)
+            latencies.append(time.perf_counter() - started)
+
+    lags = []
+    tick = asyncio.ensure_future(ticker(lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    tick.cancel()
+    return elapsed, sorted(latencies), max(lags, default=0)
+
+
+def report(label, count, elapsed, latencies, lag):
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(
+        f"  {label:<18} {count / elapsed:7.0f} req/s  p50 {p50 * 1000:7.1f} ms  "
+        f"p99 {p99 * 1000:7.1f} ms  max loop lag {lag * 1000:7.1f} ms"
+    )
+
+
+async def main(documents=200, repeats=4, concurrency=32, workers=None):
+    # Each document is requested several times, some of them concurrently,
+    # as when several editors preview the same draft.
+    markdown = [text for _, text in generate_corpus(CorpusConfig(documents=documents, blocks=20))]
+    requests = markdown * repeats
+    random.Random(0).shuffle(requests)
+    print(f"{len(requests)} requests for {documents} documents, {concurrency} at a time")
+
+    async def blocking(text):
+        # Yield once, as reading the request off the socket would, so the
+        # loop gets a chance to run other tasks between renders.
+        await asyncio.sleep(0)
+        return convert(text)
+
+    report("direct call", len(requests), *await serve(requests, blocking, concurrency))
+    async with AsyncConverter(workers=workers, cache_bytes=0) as converter:
+        report("pool, no cache", len(requests), *await serve(requests, converter.convert, concurrency))
+        print(f"    {converter.rendered} renders, {converter.coalesced} coalesced")
+    async with AsyncConverter(workers=workers) as converter:
+        report("pool", len(requests), *await serve(requests, converter.convert, concurrency))
+        print(f"    {converter.rendered} renders, {converter.coalesced} coalesced")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
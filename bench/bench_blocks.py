@@ -0,0 +1,78 @@
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inline_markdown import block_to_block_type
+
+
+def string_block_to_block_type(markdown_block):
+    blocks = {
+        0: "paragraph",
+        1: "heading",
+        2: "code",
+        3: "quote",
+        4: "unordered_list",
+        5: "ordered_list"
+    }
+    parts = markdown_block.split(" ")
+    if bool(re.match(r"^#{1,6}", parts[0])):
+        return blocks[1]
+    elif bool(re.match(r"^`{3}", parts[0])):
+        if len(parts) == 1:
+            if bool(re.match(r"`{3}", parts[0])):
+                return blocks[2]
+        else:
+            if bool(re.match(r"`{3}", parts[-1][-3:])):
+                return blocks[2]
+    elif bool(re.match(r"^>", parts[0])):
+        return blocks[3]
+    elif bool(re.match(r"^\*", parts[0])):
+        return blocks[4]
+    elif bool(re.match(r"^\d+\.$", parts[0])):
+        return blocks[5]
+    else:
+        return blocks[0]
+
+
+def make_blocks(count, seed=0):
+    rng = random.Random(seed)
+    words = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do".split()
+
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    blocks = []
+    for _ in range(count):
+        kind = rng.randrange(6)
+        lines = rng.randint(1, 6)
+        if kind == 0:
+            blocks.append("\n".join(sentence(12) for _ in range(lines)))
+        elif kind == 1:
+            blocks.append("#" * rng.randint(1, 6) + " " + sentence(5))
+        elif kind == 2:
+            blocks.append("```\n" + "\n".join(sentence(8) for _ in range(lines)) + "\n```")
+        elif kind == 3:
+            blocks.append("\n".join("> " + sentence(10) for _ in range(lines)))
+        elif kind == 4:
+            blocks.append("\n".join("* " + sentence(6) for _ in range(lines)))
+        else:
+            blocks.append("\n".join(f"{i + 1}. " + sentence(6) for i in range(lines)))
+    return blocks
+
+
+def main():
+    blocks = make_blocks(20000)
+    for name, classify in (
+        ("string/re.match", string_block_to_block_type),
+        ("dispatch table", block_to_block_type),
+    ):
+        seconds = min(timeit.repeat(lambda: [classify(b) for b in blocks], number=1, repeat=5))
+        print(f"{name:>16}: {len(blocks) / seconds / 1000:8.0f}k blocks/s")
+
+
+if __name__ == "__main__":
+    main()
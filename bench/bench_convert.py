@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CorpusConfig, generate_corpus
+from block_markdown import markdown_to_html_node
+from convert import convert_many
+
+
+def timed(label, documents, run):
+    started = time.perf_counter()
+    results = run()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {elapsed:6.2f} s  {len(documents) / elapsed:8.0f} docs/s")
+    return results
+
+
+def main(documents=5000, blocks=8, workers=None):
+    # Preview-sized documents; each page is a repeat of an earlier one with
+    # probability 1/4, as when an editor re-previews an unchanged draft.
+    config = CorpusConfig(documents=documents, blocks=blocks)
+    markdown = [text for _, text in generate_corpus(config)]
+    for i in range(0, len(markdown), 4):
+        markdown[i] = markdown[i // 2]
+    workers = workers or os.cpu_count() or 1
+    size = sum(map(len, markdown))
+    print(f"{len(markdown)} documents, {size / 1024 / 1024:.1f} MiB")
+
+    expected = timed(
+        "per-document loop", markdown, lambda: [markdown_to_html_node(text).to_html() for text in markdown]
+    )
+    results = timed("convert_many", markdown, lambda: list(convert_many(markdown)))
+    assert results == expected
+    results = timed("convert_many, no cache", markdown, lambda: list(convert_many(markdown, cache_bytes=0)))
+    assert results == expected
+    results = timed(
+        "convert_many, inline cache", markdown, lambda: list(convert_many(markdown, inline_cache_bytes=32 << 20))
+    )
+    assert results == expected
+    results = timed(
+        f"convert_many, workers={workers}", markdown, lambda: list(convert_many(markdown, workers=workers))
+    )
+    assert results == expected
+
+
+if __name__ == "__main__":
+    main()
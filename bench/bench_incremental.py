@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CorpusConfig, generate_document
+from block_cache import BlockCache
+from build import render_page
+
+
+def main(target_bytes=5 * 1024 * 1024, edits=10):
+    config = CorpusConfig(blocks=200)
+    rng = random.Random(config.seed)
+    chunks = []
+    size = 0
+    while size < target_bytes:
+        chunk = generate_document(rng, config, f"Part {len(chunks)}")
+        chunks.append(chunk)
+        size += len(chunk)
+    markdown = "\n".join(chunks)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reference.md")
+        with open(path, "w") as f:
+            f.write(markdown)
+        cache = BlockCache()
+        started = time.perf_counter()
+        render_page(tmp, "reference.md", block_cache=cache)
+        first = time.perf_counter() - started
+
+        full = []
+        incremental = []
+        for edit in range(edits):
+            # Change one paragraph somewhere in the middle of the page.
+            position = markdown.index("\n\n", len(markdown) * (edit + 1) // (edits + 2))
+            markdown = markdown[:position] + f" edited {edit}" + markdown[position:]
+            with open(path, "w") as f:
+                f.write(markdown)
+
+            started = time.perf_counter()
+            expected = render_page(tmp, "reference.md")
+            full.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            html = render_page(tmp, "reference.md", block_cache=cache)
+            incremental.append(time.perf_counter() - started)
+            assert html == expected
+
+    full.sort()
+    incremental.sort()
+    print(f"{len(markdown) / 1024 / 1024:.1f} MiB page, first render with cache {first * 1000:.0f} ms")
+    print(f"  full re-render        p50 {full[len(full) // 2] * 1000:7.1f} ms")
+    print(f"  block-cached re-render p50 {incremental[len(incremental) // 2] * 1000:7.1f} ms "
+          f"({cache.hits} hits, {cache.misses} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from inline_markdown import (
+    text_to_textnodes,
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+)
+
+
+def chained_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+def make_paragraph(spans):
+    parts = []
+    for i in range(spans):
+        kind = i % 5
+        if kind == 0:
+            parts.append(f"some **bold {i}** text")
+        elif kind == 1:
+            parts.append(f"an *italic {i}* word")
+        elif kind == 2:
+            parts.append(f"a `code {i}` span")
+        elif kind == 3:
+            parts.append(f"an ![image {i}](https://example.com/{i}.png)")
+        else:
+            parts.append(f"a [link {i}](https://example.com/{i})")
+    return " and ".join(parts)
+
+
+def main():
+    for spans in (100, 1000, 5000):
+        text = make_paragraph(spans)
+        assert text_to_textnodes(text) == chained_text_to_textnodes(text)
+        number = max(1, 2000 // spans)
+        chained = min(timeit.repeat(lambda: chained_text_to_textnodes(text), number=number, repeat=3)) / number
+        single = min(timeit.repeat(lambda: text_to_textnodes(text), number=number, repeat=3)) / number
+        print(
+            f"{spans:>5} spans  chained {chained * 1000:9.2f} ms  "
+            f"single-pass {single * 1000:9.2f} ms  speedup {chained / single:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
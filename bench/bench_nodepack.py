@@ -0,0 +1,33 @@
+import os
+import pickle
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CorpusConfig, generate_corpus
+from block_markdown import markdown_to_html_node
+from nodepack import pack_html, unpack_html
+
+
+def main():
+    trees = [markdown_to_html_node(markdown) for _, markdown in generate_corpus(CorpusConfig(documents=50))]
+    packed = [pack_html(tree) for tree in trees]
+    assert [unpack_html(page).to_html() for page in packed] == [tree.to_html() for tree in trees]
+
+    # What a worker would send back and what the parent would rebuild.
+    formats = (
+        ("pickled nodes", lambda: [pickle.dumps(tree, pickle.HIGHEST_PROTOCOL) for tree in trees], pickle.loads),
+        ("packed nodes", lambda: [pickle.dumps(pack_html(tree), pickle.HIGHEST_PROTOCOL) for tree in trees],
+         lambda data: unpack_html(pickle.loads(data))),
+    )
+    for name, dumps, loads in formats:
+        payloads = dumps()
+        size = sum(len(data) for data in payloads)
+        dump_seconds = min(timeit.repeat(dumps, number=3, repeat=5)) / 3
+        load_seconds = min(timeit.repeat(lambda: [loads(data) for data in payloads], number=3, repeat=5)) / 3
+        print(f"{name:>14}: {size / 1024:8.1f} KiB  dumps {dump_seconds * 1000:7.2f} ms  loads {load_seconds * 1000:7.2f} ms  ({len(trees)} pages)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from htmlnode import LeafNode, ParentNode
+
+
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+class DictLeafNode(DictHTMLNode):
+    def __init__(self, tag, value, props=None):
+        super().__init__(tag=tag, value=value, children=None, props=props)
+
+
+class DictParentNode(DictHTMLNode):
+    def __init__(self, tag, children, props=None):
+        super().__init__(tag=tag, value=None, children=children, props=props)
+
+
+def build_corpus(text_cls, leaf_cls, parent_cls, pages, paragraphs, spans):
+    site = []
+    for page in range(pages):
+        blocks = []
+        for paragraph in range(paragraphs):
+            text_nodes = []
+            leaves = []
+            for span in range(spans):
+                # Tags are built at runtime the way a parser slices them out of
+                # the source, so they are not already interned literals.
+                tag = "b" if span % 2 else "".join(["i"])
+                text_nodes.append(text_cls(f"text {span}", TextType.TEXT))
+                leaves.append(leaf_cls(tag, f"text {span}", {}))
+            blocks.append(parent_cls("".join(["p"]), leaves))
+            site.append(text_nodes)
+        site.append(parent_cls("div", blocks))
+    return site
+
+
+def measure(text_cls, leaf_cls, parent_cls, pages, paragraphs, spans):
+    tracemalloc.start()
+    site = build_corpus(text_cls, leaf_cls, parent_cls, pages, paragraphs, spans)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del site
+    return current, peak
+
+
+def main():
+    pages, paragraphs, spans = 200, 20, 20
+    nodes = pages * paragraphs * (spans * 2 + 1) + pages
+    for name, classes in (
+        ("dict", (DictTextNode, DictLeafNode, DictParentNode)),
+        ("slots", (TextNode, LeafNode, ParentNode)),
+    ):
+        current, peak = measure(*classes, pages, paragraphs, spans)
+        print(
+            f"{name:>5}: {nodes} nodes  current {current / 2**20:7.1f} MiB  "
+            f"peak {peak / 2**20:7.1f} MiB  {current / nodes:6.1f} B/node"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CorpusConfig, generate_corpus
+from block_markdown import markdown_to_html_node
+from htmlnode import LeafNode, ParentNode
+
+
+class UnescapedLeafNode:
+    def __init__(self, tag, value, props=None):
+        self.tag = tag
+        self.value = value
+        self.props = props
+
+    def props_to_html(self):
+        if not self.props:
+            return ""
+        return " " + " ".join(f'{key}="{value}"' for key, value in self.props.items())
+
+    def to_html(self):
+        if self.tag == "img":
+            return f"<{self.tag}{self.props_to_html()}>"
+        if self.value is None or len(self.value) == 0:
+            raise ValueError("LeafNode must have a non-empty value")
+        if self.tag is None:
+            return self.value
+        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+
+
+class UnescapedParentNode(UnescapedLeafNode):
+    def __init__(self, tag, children, props=None):
+        super().__init__(tag, None, props)
+        self.children = children
+
+    def to_html(self):
+        body = "".join(x.to_html() for x in self.children)
+        return f"<{self.tag}{self.props_to_html()}>{body}</{self.tag}>"
+
+
+def unescaped_copy(node):
+    if isinstance(node, ParentNode):
+        return UnescapedParentNode(node.tag, [unescaped_copy(child) for child in node.children], node.props)
+    return UnescapedLeafNode(node.tag, node.value, node.props)
+
+
+def main():
+    trees = [markdown_to_html_node(markdown) for _, markdown in generate_corpus(CorpusConfig(documents=50))]
+    old_trees = [unescaped_copy(tree) for tree in trees]
+    leaves = sum(1 for tree in trees for _ in walk_leaves(tree))
+
+    for name, pages in (("unescaped f-strings", old_trees), ("escaped render layer", trees)):
+        seconds = min(timeit.repeat(lambda: [page.to_html() for page in pages], number=5, repeat=5)) / 5
+        print(f"{name:>21}: {seconds * 1000:7.2f} ms for {len(pages)} pages ({leaves} leaves)")
+
+
+def walk_leaves(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, LeafNode):
+            yield node
+        else:
+            stack.extend(node.children)
+
+
+if __name__ == "__main__":
+    main()
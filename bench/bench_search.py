@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import CorpusConfig, write_corpus
+from build import build_site
+from search_index import SEARCH_DIR
+
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def main(documents=10000, blocks=10, workers=None):
+    config = CorpusConfig(documents=documents, blocks=blocks)
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content")
+        write_corpus(content, config)
+        timings = {}
+        for search in (False, True):
+            public = os.path.join(tmp, f"public-{search}")
+            started = time.perf_counter()
+            report = build_site(content, public, workers=workers, search=search)
+            timings[search] = time.perf_counter() - started
+        search_dir = os.path.join(tmp, "public-True", SEARCH_DIR)
+        shards = len(os.listdir(search_dir))
+        size = directory_size(search_dir)
+        site = directory_size(os.path.join(tmp, "public-False"))
+
+    print(f"{documents} pages, {report.search['pages']} indexed")
+    print(f"  build without search {timings[False]:7.2f} s")
+    print(f"  build with search    {timings[True]:7.2f} s "
+          f"(+{(timings[True] - timings[False]) / timings[False] * 100:.0f}%)")
+    print(f"  index {size / 1024 / 1024:.1f} MiB in {shards} files "
+          f"({size / site * 100:.0f}% of {site / 1024 / 1024:.1f} MiB of pages)")
+
+
+if __name__ == "__main__":
+    main()
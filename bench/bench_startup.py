@@ -0,0 +1,89 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Cumulative import time of main, stdlib included, that the CLI's cold start
+# may spend before doing any work.
+IMPORT_BUDGET_MS = 40
+
+# Subsystems a plain build must not load until they are asked for.
+LAZY_MODULES = (
+    "concurrent.futures.process",
+    "inline_cache",
+    "profiling",
+    "search_index",
+    "serve",
+)
+
+
+def import_times():
+    # -X importtime reports "self | cumulative | name" in microseconds on
+    # stderr, one line per module, innermost first.
+    code = "import sys, main; print(','.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules, set(result.stdout.strip().split(","))
+
+
+def wall_time(args):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=SRC_DIR, capture_output=True, check=True)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the CLI's cold start.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    cumulative = []
+    for _ in range(args.runs):
+        modules, loaded = import_times()
+        cumulative.append(modules["main"][1] / 1000)
+    repo_modules = {
+        os.path.splitext(name)[0] for name in os.listdir(SRC_DIR) if name.endswith(".py")
+    }
+    own = sorted(
+        ((times[0], name) for name, times in modules.items() if name in repo_modules),
+        reverse=True,
+    )
+    baseline = statistics.median(wall_time(["-c", "pass"]) for _ in range(args.runs))
+    cli = statistics.median(wall_time(["main.py", "--help"]) for _ in range(args.runs))
+
+    import_ms = statistics.median(cumulative)
+    print(f"import main      p50 {import_ms:6.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"main.py --help   p50 {cli * 1000:6.1f} ms, {(cli - baseline) * 1000:.1f} ms over a bare interpreter")
+    print("slowest project modules (self time):")
+    for self_us, name in own[:5]:
+        print(f"  {name:<16} {self_us / 1000:5.1f} ms")
+
+    failed = False
+    leaked = [name for name in LAZY_MODULES if name in loaded]
+    if leaked:
+        print(f"imported eagerly: {', '.join(leaked)}")
+        failed = True
+    if import_ms > args.budget_ms:
+        print("over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from build import build_site
+from serve import Watcher
+
+
+def main(pages=5000, edits=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content")
+        public = os.path.join(tmp, "public")
+        for i in range(pages):
+            path = os.path.join(content, f"section{i % 50}", f"page{i}.md")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(f"# Page {i}\n\nSome **bold** text and a [link](/page{i + 1}.html).\n")
+        build_site(content, public)
+        watcher = Watcher(content, public)
+
+        latencies = []
+        for edit in range(edits):
+            path = os.path.join(content, f"section{edit % 50}", f"page{edit}.md")
+            with open(path, "a") as f:
+                f.write(f"\nEdit number {edit}.\n")
+            started = time.perf_counter()
+            changed, deleted = watcher.poll()
+            watcher.poll_pages(changed)
+            watcher.rebuild(changed, deleted)
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert changed == [os.path.relpath(path, content)]
+
+        latencies.sort()
+        print(
+            f"{pages} pages: scan, debounce check and re-render of one edited page "
+            f"p50 {latencies[len(latencies) // 2]:.1f} ms  max {latencies[-1]:.1f} ms "
+            f"(plus up to {watcher.interval * 1000:.0f} ms poll interval "
+            f"and {watcher.debounce * 1000:.0f} ms debounce)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import random
+
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog static site generator markdown "
+    "html node block inline parser render page build template asset cache "
+    "link image heading paragraph list quote code python module function"
+).split()
+
+
+class CorpusConfig:
+    def __init__(
+        self,
+        documents=100,
+        blocks=40,
+        paragraph_words=60,
+        link_density=0.05,
+        image_density=0.01,
+        emphasis_density=0.05,
+        nesting=2,
+        seed=0,
+    ):
+        self.documents = documents
+        self.blocks = blocks
+        self.paragraph_words = paragraph_words
+        # Densities are per word: 0.05 means roughly one link every 20 words.
+        self.link_density = link_density
+        self.image_density = image_density
+        self.emphasis_density = emphasis_density
+        # How many directory levels the generated pages are spread over.
+        self.nesting = nesting
+        self.seed = seed
+
+    def __repr__(self):
+        return f"CorpusConfig({self.__dict__})"
+
+
+def generate_inline(rng, config, words):
+    parts = []
+    for i in range(words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < config.link_density:
+            parts.append(f"[{word} {i}](/{word}/{i}.html)")
+        elif roll < config.link_density + config.image_density:
+            parts.append(f"![{word}](/images/{word}-{i}.png)")
+        elif roll < config.link_density + config.image_density + config.emphasis_density:
+            style = rng.randrange(3)
+            if style == 0:
+                parts.append(f"**{word}**")
+            elif style == 1:
+                parts.append(f"*{word}*")
+            else:
+                parts.append(f"`{word}()`")
+        else:
+            parts.append(word)
+    return " ".join(parts)
+
+
+def generate_block(rng, config):
+    kind = rng.random()
+    if kind < 0.55:
+        words = max(1, int(rng.gauss(config.paragraph_words, config.paragraph_words / 4)))
+        text = generate_inline(rng, config, words)
+        # Wrap long paragraphs over several source lines like hand-written docs.
+        tokens = text.split(" ")
+        return "\n".join(" ".join(tokens[i:i + 12]) for i in range(0, len(tokens), 12))
+    if kind < 0.65:
+        return "#" * rng.randint(2, 4) + " " + generate_inline(rng, config, rng.randint(2, 6))
+    if kind < 0.75:
+        items = rng.randint(2, 6)
+        return "\n".join("* " + generate_inline(rng, config, rng.randint(3, 10)) for _ in range(items))
+    if kind < 0.82:
+        items = rng.randint(2, 6)
+        return "\n".join(
+            f"{i + 1}. " + generate_inline(rng, config, rng.randint(3, 10)) for i in range(items)
+        )
+    if kind < 0.90:
+        lines = rng.randint(1, 4)
+        return "\n".join("> " + generate_inline(rng, config, rng.randint(5, 15)) for _ in range(lines))
+    lines = rng.randint(2, 12)
+    code = "\n".join(
+        "    " * rng.randint(0, 2) + " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8)))
+        for _ in range(lines)
+    )
+    return f"```python\n{code}\n```"
+
+
+def generate_document(rng, config, title):
+    blocks = [f"# {title}"]
+    for _ in range(config.blocks):
+        blocks.append(generate_block(rng, config))
+    return "\n\n".join(blocks) + "\n"
+
+
+def document_path(index, config):
+    parts = [f"section{(index // (10 ** level)) % 10}" for level in range(config.nesting, 0, -1)]
+    return os.path.join(*parts, f"page{index}.md")
+
+
+def generate_corpus(config):
+    rng = random.Random(config.seed)
+    for index in range(config.documents):
+        yield document_path(index, config), generate_document(rng, config, f"Page {index}")
+
+
+def write_corpus(content_dir, config):
+    paths = []
+    for path, markdown in generate_corpus(config):
+        full_path = os.path.join(content_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        paths.append(path)
+    return paths
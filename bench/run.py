@@ -0,0 +1,270 @@
+import argparse
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from corpus import CorpusConfig, generate_corpus, generate_inline, write_corpus
+from textnode import TextNode, TextType
+from inline_markdown import (
+    text_to_textnodes,
+    parse_inline,
+    split_nodes_image,
+    split_nodes_link,
+    markdown_to_blocks,
+    block_to_block_type,
+)
+from block_markdown import markdown_to_html_node, use_inline_cache
+from inline_cache import InlineCache
+from build import build_site, render_markdown
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# Each registered function takes the corpus config and returns
+# (callable, operations per call). The callable is what gets timed.
+
+
+@benchmark("text_to_textnodes")
+def bench_text_to_textnodes(config):
+    rng = random.Random(config.seed)
+    paragraphs = [generate_inline(rng, config, config.paragraph_words) for _ in range(200)]
+
+    def run():
+        for text in paragraphs:
+            text_to_textnodes(text)
+    return run, len(paragraphs)
+
+
+@benchmark("parse_inline")
+def bench_parse_inline(config):
+    rng = random.Random(config.seed)
+    paragraphs = [generate_inline(rng, config, config.paragraph_words) for _ in range(200)]
+
+    def run():
+        for text in paragraphs:
+            parse_inline(text)
+    return run, len(paragraphs)
+
+
+@benchmark("split_nodes_image_link")
+def bench_split_nodes_image_link(config):
+    rng = random.Random(config.seed)
+    nodes = [
+        TextNode(generate_inline(rng, config, config.paragraph_words).replace("*", "").replace("`", ""), TextType.TEXT)
+        for _ in range(200)
+    ]
+
+    def run():
+        split_nodes_link(split_nodes_image(nodes))
+    return run, len(nodes)
+
+
+@benchmark("block_to_block_type")
+def bench_block_to_block_type(config):
+    blocks = []
+    for _, markdown in generate_corpus(config):
+        blocks.extend(markdown_to_blocks(markdown))
+        if len(blocks) > 5000:
+            break
+
+    def run():
+        for block in blocks:
+            block_to_block_type(block)
+    return run, len(blocks)
+
+
+@benchmark("parent_node_to_html")
+def bench_to_html(config):
+    trees = []
+    for _, markdown in generate_corpus(config):
+        trees.append(markdown_to_html_node(markdown))
+        if len(trees) == 20:
+            break
+
+    def run():
+        for tree in trees:
+            tree.to_html()
+    return run, len(trees)
+
+
+@benchmark("render_page")
+def bench_render_page(config):
+    documents = [markdown for _, markdown in generate_corpus(config)][:20]
+
+    def run():
+        for markdown in documents:
+            render_markdown(markdown, "page")
+    return run, len(documents)
+
+
+@benchmark("render_page_inline_cache")
+def bench_render_page_inline_cache(config):
+    documents = [markdown for _, markdown in generate_corpus(config)][:20]
+    cache = InlineCache()
+
+    def run():
+        previous = use_inline_cache(cache)
+        try:
+            for markdown in documents:
+                render_markdown(markdown, "page")
+        finally:
+            use_inline_cache(previous)
+    return run, len(documents)
+
+
+@benchmark("build_site")
+def bench_build_site(config):
+    tmp = tempfile.mkdtemp(prefix="ssg-bench-")
+    atexit.register(shutil.rmtree, tmp, True)
+    content = os.path.join(tmp, "content")
+    public = os.path.join(tmp, "public")
+    pages = write_corpus(content, config)
+
+    def run():
+        build_site(content, public, workers=1)
+    return run, len(pages)
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(setup, config, repeat, min_time):
+    run, operations = setup(config)
+    run()  # warm up caches and lazy imports outside the timed region
+
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < repeat or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - t0) / operations)
+        if len(samples) >= repeat * 20:
+            break
+    samples.sort()
+
+    # Allocation tracking slows everything down, so peak memory is taken
+    # from a separate, untimed call.
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50 = percentile(samples, 0.50)
+    return {
+        "operations_per_call": operations,
+        "samples": len(samples),
+        "ops_per_sec": 1.0 / p50 if p50 else None,
+        "p50_ms": p50 * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "peak_memory_bytes": peak,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"{name:>24}: {before['p50_ms']:9.4f} -> {result['p50_ms']:9.4f} ms/op  x{ratio:5.2f}  {status}", file=sys.stderr)
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the markdown to HTML pipeline.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--blocks", type=int, default=40, help="blocks per document")
+    parser.add_argument("--paragraph-words", type=int, default=60)
+    parser.add_argument("--link-density", type=float, default=0.05)
+    parser.add_argument("--image-density", type=float, default=0.01)
+    parser.add_argument("--emphasis-density", type=float, default=0.05)
+    parser.add_argument("--nesting", type=int, default=2, help="directory levels pages are spread over")
+    parser.add_argument("--repeat", type=int, default=10, help="minimum timed calls per benchmark")
+    parser.add_argument("--min-time", type=float, default=1.0, help="minimum seconds per benchmark")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed p50 slowdown before failing")
+    args = parser.parse_args(argv)
+
+    names = args.names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    config = CorpusConfig(
+        documents=args.documents,
+        blocks=args.blocks,
+        paragraph_words=args.paragraph_words,
+        link_density=args.link_density,
+        image_density=args.image_density,
+        emphasis_density=args.emphasis_density,
+        nesting=args.nesting,
+        seed=args.seed,
+    )
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "corpus": dict(config.__dict__),
+        "benchmarks": {},
+    }
+    for name in names:
+        results["benchmarks"][name] = measure(BENCHMARKS[name], config, args.repeat, args.min_time)
+        print(f"{name:>24}: {results['benchmarks'][name]['p50_ms']:9.4f} ms/op", file=sys.stderr)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
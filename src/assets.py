@@ -0,0 +1,193 @@
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from build_cache import file_hash
+
+
+ASSET_STATE_VERSION = 1
+
+# Written into the public directory when names are hashed, mapping each
+# static path to the name it was published under.
+ASSET_MANIFEST = "asset-manifest.json"
+
+HASH_LENGTH = 12
+
+
+def scan_static(static_dir):
+    found = {}
+    stack = [(static_dir, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append((entry.path, prefix + entry.name + "/"))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    found[prefix + entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+def hashed_name(name, digest):
+    root, ext = os.path.splitext(name)
+    return f"{root}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def asset_urls(published):
+    return {"/" + name: "/" + output for name, output in published.items() if name != output}
+
+
+def rewrite_asset_urls(text, urls):
+    # Only quoted absolute paths are rewritten, so "/style.css" in an href
+    # changes but prose mentioning style.css does not.
+    for url, hashed_url in urls.items():
+        text = text.replace(f'"{url}"', f'"{hashed_url}"')
+    return text
+
+
+class AssetReport:
+    def __init__(self):
+        self.copied = []
+        self.skipped = []
+        self.removed = []
+        self.published = {}
+
+    def __repr__(self):
+        return (
+            f"AssetReport(copied={len(self.copied)}, "
+            f"skipped={len(self.skipped)}, removed={len(self.removed)})"
+        )
+
+    def urls(self):
+        return asset_urls(self.published)
+
+
+class AssetState:
+    def __init__(self, path=None):
+        self.path = path
+        self.files = {}
+        if path is None:
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == ASSET_STATE_VERSION:
+            self.files = data.get("files", {})
+
+    def __repr__(self):
+        return f"AssetState({self.path}, {len(self.files)} files)"
+
+    def save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": ASSET_STATE_VERSION, "files": self.files}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _same_stat(stat, other):
+    return stat.st_size == other.st_size and stat.st_mtime_ns == other.st_mtime_ns
+
+
+def _publish(source, dest, stat, link):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = dest + ".tmp"
+    if link:
+        try:
+            os.link(source, tmp)
+            # A hard link shares the source inode, so it is replaced rather
+            # than written into and can never clobber the source.
+            os.replace(tmp, dest)
+            return
+        except OSError:
+            if os.path.lexists(tmp):
+                os.remove(tmp)
+    # copyfile uses sendfile or copy_file_range where the platform has it.
+    shutil.copyfile(source, tmp)
+    # Keep the source mtime so the next sync can skip on stat alone.
+    os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp, dest)
+
+
+def _sync_file(static_dir, public_dir, name, entry, hashed, link):
+    source = os.path.join(static_dir, name)
+    stat = os.stat(source)
+    digest = None
+    if entry is not None and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        digest = entry["hash"]
+    if digest is None and hashed:
+        digest = file_hash(source)
+    output = hashed_name(name, digest) if hashed else name
+    dest = os.path.join(public_dir, output)
+    try:
+        existing = os.stat(dest)
+    except FileNotFoundError:
+        existing = None
+    fresh = False
+    if existing is not None and existing.st_size == stat.st_size:
+        if hashed or _same_stat(existing, stat):
+            # A hashed name already pins the content.
+            fresh = True
+        else:
+            if digest is None:
+                digest = file_hash(source)
+            fresh = file_hash(dest) == digest
+            if fresh:
+                os.utime(dest, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    if not fresh:
+        _publish(source, dest, stat, link)
+    # digest stays None when nothing needed it; it is filled in lazily.
+    entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": digest, "output": output}
+    return name, entry, not fresh
+
+
+def sync_static(static_dir, public_dir, hashed=False, link=False, workers=None, state_path=None):
+    report = AssetReport()
+    state = AssetState(state_path)
+    names = sorted(scan_static(static_dir)) if os.path.isdir(static_dir) else []
+    previous = state.files
+    if hashed:
+        # A hashed name promises fixed content; a link would follow later
+        # in-place edits of the source.
+        link = False
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            lambda name: _sync_file(static_dir, public_dir, name, previous.get(name), hashed, link),
+            names,
+        ))
+
+    files = {}
+    for name, entry, copied in results:
+        files[name] = entry
+        report.published[name] = entry["output"]
+        path = os.path.join(public_dir, entry["output"])
+        if copied:
+            report.copied.append(path)
+        else:
+            report.skipped.append(path)
+
+    outputs = {entry["output"] for entry in files.values()}
+    for name, entry in previous.items():
+        if entry["output"] in outputs:
+            continue
+        path = os.path.join(public_dir, entry["output"])
+        if os.path.exists(path):
+            os.remove(path)
+            report.removed.append(path)
+
+    manifest_path = os.path.join(public_dir, ASSET_MANIFEST)
+    if hashed:
+        os.makedirs(public_dir, exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(report.published, f, indent=1, sort_keys=True)
+    elif os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    state.files = files
+    state.save()
+    return report
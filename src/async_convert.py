@@ -0,0 +1,167 @@
+import asyncio
+import functools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from block_markdown import block_to_html_node
+from convert import BATCH_CACHE_BYTES, DocumentCache, convert
+from inline_markdown import markdown_to_blocks
+
+
+# Renders handed to the pool per worker at once; callers past that wait
+# for a slot, so a burst of requests queues here rather than in the pool.
+PENDING_PER_WORKER = 2
+
+# Blocks per chunk of a streamed document, and how many chunks are rendered
+# ahead of the one being sent.
+STREAM_BLOCKS = 64
+STREAM_AHEAD = 2
+
+
+def _render_document(markdown):
+    return convert(markdown)
+
+
+def _render_blocks(blocks):
+    return "".join(block_to_html_node(block).to_html() for block in blocks)
+
+
+class _Render:
+    # One render in flight, shared by every request for the same input.
+    __slots__ = ("task", "waiters", "started")
+
+    def __init__(self):
+        self.task = None
+        self.waiters = 0
+        self.started = False
+
+
+class AsyncConverter:
+    # Converts markdown off the event loop in a process pool. Identical
+    # requests in flight at the same time share one render, and whole
+    # documents are kept in a DocumentCache.
+    def __init__(
+        self,
+        workers=None,
+        executor=None,
+        max_pending=None,
+        timeout=None,
+        cache_bytes=BATCH_CACHE_BYTES,
+    ):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if max_pending is None:
+            max_pending = workers * PENDING_PER_WORKER
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1, got {max_pending}")
+        self.owned = executor is None
+        self.executor = ProcessPoolExecutor(max_workers=workers) if executor is None else executor
+        self.timeout = timeout
+        self.cache = DocumentCache(cache_bytes) if cache_bytes else None
+        self.slots = asyncio.Semaphore(max_pending)
+        self.renders = {}
+        self.rendered = 0
+        self.coalesced = 0
+
+    def __repr__(self):
+        return (
+            f"AsyncConverter({len(self.renders)} in flight, rendered={self.rendered}, "
+            f"coalesced={self.coalesced}, cache={self.cache!r})"
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        for render in list(self.renders.values()):
+            render.task.cancel()
+        if self.owned:
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self.executor.shutdown, wait=True, cancel_futures=True)
+            )
+
+    async def convert(self, markdown, timeout=None):
+        # Raises TimeoutError once timeout (or the converter's default)
+        # seconds pass, counting any wait for a free slot.
+        if self.cache is not None:
+            html = self.cache.get(markdown)
+            if html is not None:
+                return html
+        html = await self._run(_render_document, markdown, self._timeout(timeout))
+        if self.cache is not None:
+            self.cache.put(markdown, html)
+        return html
+
+    async def stream(self, markdown, timeout=None, blocks_per_chunk=STREAM_BLOCKS):
+        # Yields the same HTML as convert() in chunks, the first of them as
+        # soon as the first group of blocks is rendered. timeout covers the
+        # whole document.
+        if self.cache is not None:
+            html = self.cache.get(markdown)
+            if html is not None:
+                yield html
+                return
+        timeout = self._timeout(timeout)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        # Splitting into blocks is a single cheap pass; rendering them is
+        # what goes to the pool.
+        blocks = markdown_to_blocks(markdown)
+        groups = deque(
+            tuple(blocks[i : i + blocks_per_chunk]) for i in range(0, len(blocks), blocks_per_chunk)
+        )
+        ahead = deque()
+        try:
+            yield "<div>"
+            while groups or ahead:
+                while groups and len(ahead) <= STREAM_AHEAD:
+                    ahead.append(asyncio.ensure_future(self._run(_render_blocks, groups.popleft())))
+                remaining = None if deadline is None else max(0, deadline - loop.time())
+                yield await asyncio.wait_for(ahead.popleft(), remaining)
+            yield "</div>"
+        finally:
+            for task in ahead:
+                task.cancel()
+
+    def _timeout(self, timeout):
+        return self.timeout if timeout is None else timeout
+
+    async def _run(self, function, payload, timeout=None):
+        key = (function, payload)
+        render = self.renders.get(key)
+        if render is None:
+            render = _Render()
+            render.task = asyncio.ensure_future(self._submit(function, payload, render))
+            render.task.add_done_callback(functools.partial(self._finished, key, render))
+            self.renders[key] = render
+        else:
+            self.coalesced += 1
+        render.waiters += 1
+        try:
+            # Shielded: one caller timing out must not cancel the render the
+            # others are waiting on.
+            return await asyncio.wait_for(asyncio.shield(render.task), timeout)
+        finally:
+            render.waiters -= 1
+            # Nobody wants it any more; if it has not reached the pool yet,
+            # give its place in the queue to the next request. A render that
+            # is already running is left to finish and keeps its slot.
+            if render.waiters == 0 and not render.started:
+                render.task.cancel()
+
+    async def _submit(self, function, payload, render):
+        async with self.slots:
+            render.started = True
+            self.rendered += 1
+            return await asyncio.wrap_future(self.executor.submit(function, payload))
+
+    def _finished(self, key, render, task):
+        if self.renders.get(key) is render:
+            del self.renders[key]
+        if not task.cancelled():
+            # Marks a failure nobody waited for as retrieved.
+            task.exception()
@@ -0,0 +1,57 @@
+from block_markdown import block_to_html_node, use_link_recorder
+from link_index import PageLinks
+
+
+class BlockCache:
+    # Rendered HTML of every block of the pages seen so far, keyed by the
+    # block text itself. Re-rendering a page only converts the blocks that
+    # are new or edited and stitches the rest back from their fragments.
+    def __init__(self):
+        self.pages = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"BlockCache({len(self.pages)} pages, hits={self.hits}, misses={self.misses})"
+
+    def forget(self, page):
+        self.pages.pop(page, None)
+
+    def clear(self):
+        # Needed whenever anything else that shapes block output changes,
+        # such as the asset URL map.
+        self.pages.clear()
+
+    def render(self, page, blocks, links=None):
+        previous = self.pages.get(page, {})
+        # Only the blocks of this render are kept, so a page's entries never
+        # outgrow the page itself.
+        current = {}
+        parts = ["<div>"]
+        for block in blocks:
+            entry = current.get(block) or previous.get(block)
+            if entry is None:
+                self.misses += 1
+                entry = self.render_block(block)
+            else:
+                self.hits += 1
+            current[block] = entry
+            html, block_links = entry
+            parts.append(html)
+            if links is not None and block_links is not None:
+                links.extend(block_links)
+        parts.append("</div>")
+        self.pages[page] = current
+        return "".join(parts)
+
+    def render_block(self, block):
+        block_links = PageLinks()
+        previous = use_link_recorder(block_links)
+        try:
+            html = block_to_html_node(block).to_html()
+        finally:
+            use_link_recorder(previous)
+        if not block_links.links and not block_links.images:
+            block_links = None
+        return html, block_links
+
@@ -0,0 +1,185 @@
+from inline_markdown import (
+    parse_inline,
+    markdown_to_blocks,
+    block_to_block_type,
+    BlockType,
+)
+from htmlnode import LeafNode, ParentNode, LazyParentNode
+
+
+def markdown_to_html_node(markdown):
+    return blocks_to_html_node(markdown_to_blocks(markdown))
+
+
+def blocks_to_html_node(blocks):
+    return _element("div", [block_to_html_node(block) for block in blocks])
+
+
+def _element(tag, children):
+    # ParentNode insists on children; a page, quote or code block with no
+    # content still renders, as an empty element.
+    if children:
+        return ParentNode(tag, children)
+    return LazyParentNode(tag, children)
+
+
+def blocks_to_lazy_html_node(blocks):
+    # Each block is converted only when the serializer reaches it and is
+    # dropped once written, so the page tree is never held in full.
+    return LazyParentNode("div", (block_to_html_node(block) for block in blocks))
+
+
+def block_to_html_node(block):
+    return BLOCK_RENDERERS[block_to_block_type(block)](block)
+
+
+_inline_cache = None
+
+
+def use_inline_cache(cache):
+    global _inline_cache
+    previous = _inline_cache
+    _inline_cache = cache
+    return previous
+
+
+_asset_urls = None
+
+
+def use_asset_urls(urls):
+    # urls maps a static asset path such as "/style.css" to the name it was
+    # published under; links and images pointing at it are rewritten.
+    global _asset_urls
+    previous = _asset_urls
+    _asset_urls = urls or None
+    return previous
+
+
+_link_recorder = None
+
+
+def use_link_recorder(recorder):
+    # recorder.record(children) is called with the inline nodes of every
+    # text that may hold a link or image, cached or freshly parsed.
+    global _link_recorder
+    previous = _link_recorder
+    _link_recorder = recorder
+    return previous
+
+
+_text_recorder = None
+
+
+def use_text_recorder(recorder):
+    # recorder.record(children, heading) is called with the inline nodes of
+    # every text, heading being its level or 0 outside headings.
+    global _text_recorder
+    previous = _text_recorder
+    _text_recorder = recorder
+    return previous
+
+
+def text_to_children(text, heading=0):
+    # Most prose has no inline markup at all; skip the tokenizer for it.
+    if "*" not in text and "`" not in text and "[" not in text:
+        children = [LeafNode(None, text)] if text else []
+        if _text_recorder is not None:
+            _text_recorder.record(children, heading)
+        return children
+    if _inline_cache is not None:
+        children = _inline_cache.text_to_children(text)
+    else:
+        children = parse_inline(text)
+    if _link_recorder is not None and "[" in text:
+        _link_recorder.record(children)
+    if _text_recorder is not None:
+        _text_recorder.record(children, heading)
+    if _asset_urls is not None:
+        children = [_rewrite_asset_url(child) for child in children]
+    return children
+
+
+def _rewrite_asset_url(node):
+    # Cached children are shared between pages; never edit them in place.
+    children = node.children
+    if children is not None:
+        rewritten = [_rewrite_asset_url(child) for child in children]
+        if any(new is not old for new, old in zip(rewritten, children)):
+            children = rewritten
+    props = node.props
+    if props:
+        for key in ("src", "href"):
+            url = props.get(key)
+            if url in _asset_urls:
+                props = dict(props)
+                props[key] = _asset_urls[url]
+                break
+    if props is node.props and children is node.children:
+        return node
+    if children is None:
+        return LeafNode(node.tag, node.value, props)
+    return ParentNode(node.tag, children, props)
+
+
+def paragraph_to_html_node(block):
+    # Blocks from markdown_to_blocks already have their lines stripped.
+    return ParentNode("p", text_to_children(block.replace("\n", " ")))
+
+
+def heading_to_html_node(block):
+    level = len(block) - len(block.lstrip("#"))
+    text = block[level:].strip()
+    if not text:
+        raise ValueError(f"Invalid heading: {block}")
+    return ParentNode(f"h{level}", text_to_children(text, level))
+
+
+def code_to_html_node(block):
+    # Code is emitted verbatim, so it never goes through inline parsing.
+    text = block[3:-3]
+    if "\n" in text:
+        # Drop the opening fence line along with any info string on it.
+        text = text.split("\n", 1)[1]
+    if not text:
+        return ParentNode("pre", [_element("code", [])])
+    return ParentNode("pre", [LeafNode("code", text)])
+
+
+def quote_to_html_node(block):
+    lines = []
+    for line in block.split("\n"):
+        if not line.startswith(">"):
+            raise ValueError("Invalid quote block")
+        lines.append(line.lstrip(">").strip())
+    return _element("blockquote", text_to_children(" ".join(lines)))
+
+
+def unordered_list_to_html_node(block):
+    items = [ParentNode("li", text_to_children(line[2:].strip())) for line in block.split("\n")]
+    return ParentNode("ul", items)
+
+
+def ordered_list_to_html_node(block):
+    items = [
+        ParentNode("li", text_to_children(line.split(". ", 1)[1].strip()))
+        for line in block.split("\n")
+    ]
+    return ParentNode("ol", items)
+
+
+BLOCK_RENDERERS = {
+    BlockType.PARAGRAPH: paragraph_to_html_node,
+    BlockType.HEADING: heading_to_html_node,
+    BlockType.CODE: code_to_html_node,
+    BlockType.QUOTE: quote_to_html_node,
+    BlockType.UNORDERED_LIST: unordered_list_to_html_node,
+    BlockType.ORDERED_LIST: ordered_list_to_html_node,
+}
+
+
+def extract_title(markdown):
+    for line in markdown.split("\n"):
+        line = line.strip()
+        if line.startswith("# "):
+            return line[2:].strip()
+    return None
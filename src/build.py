@@ -0,0 +1,433 @@
+import contextlib
+import json
+import os
+from collections import deque
+
+from block_markdown import (
+    blocks_to_lazy_html_node,
+    extract_title,
+    use_inline_cache,
+    use_asset_urls,
+    use_link_recorder,
+    use_text_recorder,
+)
+from inline_markdown import markdown_to_blocks, iter_blocks
+from build_cache import BuildManifest, source_fingerprint, text_hash
+from html_render import escape_text
+from link_index import LinkIndex, PageLinks, resolve_url
+from output import OutputWriter, write_if_changed
+from template import compile_template, load_template
+
+
+# Used when no layout file is given; template.html at the repo root starts
+# out as a copy of it.
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{ Title }}</title>
+<link href="/style.css" rel="stylesheet">
+</head>
+<body>
+<article>{{ Content }}</article>
+</body>
+</html>
+"""
+
+DEFAULT_TEMPLATE = compile_template(PAGE_TEMPLATE)
+
+_page_template = DEFAULT_TEMPLATE
+
+
+def use_template(template):
+    global _page_template
+    previous = _page_template
+    _page_template = template if template is not None else DEFAULT_TEMPLATE
+    return previous
+
+
+def find_pages(content_dir):
+    pages = []
+    for root, dirs, files in os.walk(content_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".md"):
+                path = os.path.join(root, name)
+                pages.append(os.path.relpath(path, content_dir))
+    return pages
+
+
+def output_name(page):
+    return os.path.splitext(page)[0] + ".html"
+
+
+def site_path(page):
+    # The output path as it appears in URLs, whatever the OS separator.
+    return output_name(page).replace(os.sep, "/")
+
+
+def render_markdown(markdown, fallback_title):
+    return render_blocks(markdown_to_blocks(markdown), fallback_title)
+
+
+def render_blocks(blocks, fallback_title, block_cache=None, page=None, links=None):
+    titles = []
+
+    def watch_title(blocks):
+        for block in blocks:
+            if not titles:
+                title = extract_title(block)
+                if title is not None:
+                    titles.append(title)
+            yield block
+
+    if block_cache is not None:
+        content = block_cache.render(page, watch_title(blocks), links)
+    else:
+        content = blocks_to_lazy_html_node(watch_title(blocks)).to_html()
+    title = titles[0] if titles else fallback_title
+    return _page_template.render({"Title": escape_text(title), "Content": content})
+
+
+def render_page(content_dir, page, links=None, block_cache=None, terms=None):
+    fallback_title = os.path.splitext(os.path.basename(page))[0]
+    # The block cache replays each block's links itself, including those of
+    # blocks it does not convert again. It does not replay search terms, so
+    # watch mode, which uses it, never builds the search index.
+    previous = use_link_recorder(links if block_cache is None else None)
+    previous_terms = use_text_recorder(terms)
+    try:
+        # Stream the source line by line so a large page is never held in
+        # memory as one string.
+        with open(os.path.join(content_dir, page), encoding="utf-8") as f:
+            return render_blocks(iter_blocks(f), fallback_title, block_cache, page, links)
+    except ValueError as e:
+        raise ValueError(f"{page}: {e}") from e
+    finally:
+        use_link_recorder(previous)
+        use_text_recorder(previous_terms)
+
+
+def render_page_indexed(content_dir, page, profile=False, search=False):
+    # Returns (html, links, terms, stats): the page, the link and image
+    # targets found while converting it, its search terms when search is set
+    # and its profile when profile is set.
+    links = PageLinks()
+    terms = None
+    if search:
+        from search_index import PageTerms
+
+        terms = PageTerms()
+    if profile:
+        import profiling
+
+        profiling.begin_page(page)
+    try:
+        html = render_page(content_dir, page, links, terms=terms)
+    finally:
+        stats = profiling.end_page() if profile else None
+    return html, links.as_dict(), terms.as_dict() if search else None, stats
+
+
+def init_worker(inline_cache_bytes, profile=False, template=None, asset_urls=None):
+    use_template(template)
+    use_asset_urls(asset_urls)
+    if inline_cache_bytes:
+        from inline_cache import InlineCache
+
+        use_inline_cache(InlineCache(inline_cache_bytes))
+    if profile:
+        import profiling
+
+        profiling.enable()
+
+
+# Pages per task handed to a render process, and tasks in flight per
+# process. Together with the OutputWriter's own bound they cap how much
+# rendered HTML is held at once, however large the site.
+RENDER_CHUNK_PAGES = 16
+PENDING_CHUNKS_PER_WORKER = 2
+
+
+def render_chunk(content_dir, pages, profile=False, search=False):
+    return [render_page_indexed(content_dir, page, profile, search) for page in pages]
+
+
+def render_pages(
+    content_dir,
+    pages,
+    workers=None,
+    inline_cache_bytes=None,
+    report=None,
+    profile=False,
+    template=None,
+    asset_urls=None,
+    search=False,
+):
+    # Yields (html, links, terms) per page, in the order of pages, as they
+    # are rendered, so each can be written before the rest are done.
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if profile and report is not None:
+        report.profile = []
+    if workers <= 1 or len(pages) <= 1:
+        results = _render_serial(
+            content_dir, pages, inline_cache_bytes, report, profile, template, asset_urls, search
+        )
+    else:
+        results = _render_parallel(
+            content_dir, pages, workers, inline_cache_bytes, profile, template, asset_urls, search
+        )
+    for html, links, terms, stats in results:
+        if profile and report is not None:
+            report.profile.append(stats)
+        yield html, links, terms
+
+
+def _render_serial(
+    content_dir, pages, inline_cache_bytes, report, profile, template, asset_urls, search
+):
+    cache = None
+    if inline_cache_bytes:
+        from inline_cache import InlineCache
+
+        cache = InlineCache(inline_cache_bytes)
+    # The hooks stay installed while the caller handles each page in
+    # between; build_site does no rendering of its own there.
+    previous = use_inline_cache(cache)
+    previous_template = use_template(template)
+    previous_urls = use_asset_urls(asset_urls)
+    if profile:
+        import profiling
+
+        profiling.enable()
+    try:
+        for page in pages:
+            yield render_page_indexed(content_dir, page, profile, search)
+    finally:
+        use_inline_cache(previous)
+        use_template(previous_template)
+        use_asset_urls(previous_urls)
+        if profile:
+            profiling.disable()
+        if cache is not None and report is not None:
+            report.inline_cache = cache.stats()
+
+
+def _render_parallel(
+    content_dir, pages, workers, inline_cache_bytes, profile, template, asset_urls, search
+):
+    # Pulls in most of multiprocessing; serial builds never need it.
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, min(RENDER_CHUNK_PAGES, len(pages) // (workers * 4)))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(inline_cache_bytes, profile, template, asset_urls),
+    ) as pool:
+        # Chunks are collected in submission order, so the written output
+        # does not depend on which worker finished first.
+        pending = deque()
+        try:
+            for start in range(0, len(pages), chunksize):
+                chunk = pages[start : start + chunksize]
+                pending.append(pool.submit(render_chunk, content_dir, chunk, profile, search))
+                if len(pending) >= workers * PENDING_CHUNKS_PER_WORKER:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def write_page(public_dir, page, html):
+    path = os.path.join(public_dir, output_name(page))
+    write_if_changed(path, html.encode("utf-8"))
+    return path
+
+
+def is_published_file(public_dir, target):
+    # A link resolving outside the output, such as "../secret.txt" from the
+    # site root, is broken whatever exists there.
+    root = os.path.abspath(public_dir)
+    path = os.path.normpath(os.path.join(root, target))
+    return os.path.commonpath((root, path)) == root and os.path.isfile(path)
+
+
+def asset_state_path(cache_dir):
+    return os.path.join(cache_dir, "assets.json") if cache_dir is not None else None
+
+
+def with_asset_urls(template, asset_urls):
+    # The layout's own references to static files, such as its stylesheet
+    # link, point at the names they were published under.
+    if not asset_urls:
+        return template
+    from assets import rewrite_asset_urls
+
+    return (template or DEFAULT_TEMPLATE).map_literals(
+        lambda text: rewrite_asset_urls(text, asset_urls)
+    )
+
+
+def config_hash(template=None, asset_urls=None):
+    return text_hash(
+        (template or DEFAULT_TEMPLATE).text,
+        json.dumps(asset_urls or {}, sort_keys=True),
+    )
+
+
+class BuildReport:
+    def __init__(self):
+        self.written = []
+        # Rendered again but byte-identical to what was already on disk.
+        self.unchanged = []
+        self.skipped = []
+        self.removed = []
+        self.inline_cache = None
+        self.profile = None
+        self.assets = None
+        self.links = None
+        self.broken_links = []
+        self.search = None
+
+    def __repr__(self):
+        return (
+            f"BuildReport(written={len(self.written)}, "
+            f"unchanged={len(self.unchanged)}, skipped={len(self.skipped)}, removed={len(self.removed)})"
+        )
+
+
+def build_site(
+    content_dir,
+    public_dir,
+    workers=None,
+    cache_dir=None,
+    force=False,
+    inline_cache_bytes=None,
+    profile=False,
+    template_path=None,
+    static_dir=None,
+    hash_assets=False,
+    link_assets=False,
+    write_workers=None,
+    search=False,
+):
+    report = BuildReport()
+    # Compiled once per build and shipped to each worker with its
+    # initializer, not re-read per page.
+    template = load_template(template_path) if template_path else None
+    asset_urls = None
+    if static_dir is not None:
+        from assets import sync_static
+
+        report.assets = sync_static(
+            static_dir,
+            public_dir,
+            hashed=hash_assets,
+            link=link_assets,
+            state_path=asset_state_path(cache_dir),
+        )
+        asset_urls = report.assets.urls()
+        template = with_asset_urls(template, asset_urls)
+    pages = find_pages(content_dir)
+    manifest = None
+    if cache_dir is not None:
+        manifest = BuildManifest(os.path.join(cache_dir, "manifest.json"))
+        if force:
+            manifest.invalidate()
+    config = config_hash(template, asset_urls)
+
+    todo = []
+    fingerprints = []
+    for page in pages:
+        source_path = os.path.join(content_dir, page)
+        output_path = os.path.join(public_dir, output_name(page))
+        if (
+            manifest is not None
+            and manifest.is_fresh(page, source_path, output_path, config)
+            and (not search or manifest.search_terms(page) is not None)
+        ):
+            report.skipped.append(output_path)
+            continue
+        todo.append(page)
+        # Fingerprint before rendering so an edit made mid-build is picked up
+        # by the next one instead of being recorded as already rendered.
+        if manifest is not None:
+            fingerprints.append(source_fingerprint(source_path))
+
+    rendered = render_pages(
+        content_dir,
+        todo,
+        workers,
+        inline_cache_bytes,
+        report,
+        profile,
+        template,
+        asset_urls,
+        search,
+    )
+    index = LinkIndex()
+    search_index = None
+    if search:
+        from search_index import SearchIndex
+
+        search_index = SearchIndex()
+    if manifest is not None:
+        # Pages skipped as fresh contribute what was recorded when they were
+        # last rendered, so both indexes always cover the whole site.
+        rendering = set(todo)
+        for page in pages:
+            if page not in rendering:
+                index.add(site_path(page), manifest.links(page))
+                if search:
+                    search_index.add("/" + site_path(page), manifest.search_terms(page))
+    # Pages are written while later ones are still rendering; closing()
+    # stops the renderers if a write fails.
+    with OutputWriter(write_workers) as writer, contextlib.closing(rendered):
+        for i, (html, links, terms) in enumerate(rendered):
+            page = todo[i]
+            writer.write(os.path.join(public_dir, output_name(page)), html)
+            index.add(site_path(page), links)
+            if search:
+                search_index.add("/" + site_path(page), terms)
+            if manifest is not None:
+                manifest.record(page, fingerprints[i], output_name(page), config, links, terms)
+
+        if manifest is not None:
+            current = set(pages)
+            for page in manifest.pages():
+                if page in current:
+                    continue
+                writer.remove(os.path.join(public_dir, manifest.output(page)))
+                manifest.forget(page)
+    report.written = writer.written
+    report.unchanged = writer.unchanged
+    report.removed = writer.removed
+
+    report.links = index
+    if search:
+        with OutputWriter(write_workers) as writer:
+            search_index.write(public_dir, writer)
+        report.search = {
+            "pages": len(search_index.pages),
+            "written": writer.written,
+            "unchanged": writer.unchanged,
+            "removed": writer.removed,
+        }
+    known = {site_path(page) for page in pages}
+    if report.assets is not None:
+        known.update(report.assets.published)
+    report.broken_links = [
+        entry
+        for entry in index.broken(known)
+        # Files placed in the output by hand are not known to the build.
+        if not is_published_file(public_dir, resolve_url(entry[0], entry[1]))
+    ]
+    # Saved only once every write has landed, so a failed write is retried
+    # by the next build instead of being recorded as done.
+    if manifest is not None:
+        manifest.save()
+    return report
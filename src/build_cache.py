@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+
+
+MANIFEST_VERSION = 2
+
+# Source files whose contents decide how markdown turns into HTML, or into the
+# links and search terms recorded for each page. Editing any of them
+# invalidates every cached page.
+CONVERTER_MODULES = (
+    "textnode.py",
+    "htmlnode.py",
+    "html_render.py",
+    "inline_markdown.py",
+    "block_markdown.py",
+    "template.py",
+    "assets.py",
+    "build.py",
+    "link_index.py",
+    "search_index.py",
+)
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def converter_hash():
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in CONVERTER_MODULES:
+        digest.update(name.encode("utf-8"))
+        digest.update(file_hash(os.path.join(src_dir, name)).encode("ascii"))
+    return digest.hexdigest()
+
+
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return {
+        "source": file_hash(path),
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+
+class BuildManifest:
+    def __init__(self, path, converter=None):
+        self.path = path
+        self.converter = converter if converter is not None else converter_hash()
+        self.entries = {}
+        self.stale = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        self.entries = data.get("pages", {})
+        # Keep the entries after a converter change so their outputs can still
+        # be found and removed, but never treat them as fresh.
+        self.stale = data.get("converter") != self.converter
+
+    def __repr__(self):
+        return f"BuildManifest({self.path}, {len(self.entries)} pages)"
+
+    def invalidate(self):
+        self.stale = True
+
+    def pages(self):
+        return list(self.entries)
+
+    def output(self, page):
+        return self.entries[page]["output"]
+
+    def is_fresh(self, page, source_path, output_path, config):
+        entry = self.entries.get(page)
+        if self.stale or entry is None or entry["config"] != config:
+            return False
+        if not os.path.exists(output_path):
+            return False
+        stat = os.stat(source_path)
+        if entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return True
+        if entry["source"] != file_hash(source_path):
+            return False
+        # Touched but unchanged: remember the new stat so the next build can
+        # skip hashing this file again.
+        entry["mtime"] = stat.st_mtime_ns
+        entry["size"] = stat.st_size
+        return True
+
+    def links(self, page):
+        return self.entries[page].get("links", {"links": [], "images": []})
+
+    def search_terms(self, page):
+        return self.entries[page].get("search")
+
+    def record(self, page, fingerprint, output, config, links=None, search=None):
+        entry = dict(fingerprint)
+        entry["config"] = config
+        entry["output"] = output
+        if links is not None:
+            entry["links"] = links
+        if search is not None:
+            entry["search"] = search
+        self.entries[page] = entry
+
+    def forget(self, page):
+        self.entries.pop(page, None)
+
+    def save(self):
+        if self.stale:
+            # Every entry that survived this build was re-recorded against
+            # the current converter, so the whole manifest is fresh again.
+            self.stale = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "converter": self.converter,
+            "pages": self.entries,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
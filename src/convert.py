@@ -0,0 +1,202 @@
+import os
+import sys
+from collections import OrderedDict, deque
+
+from block_markdown import markdown_to_html_node, use_inline_cache
+
+
+# Budget of the cache of whole converted documents kept across a batch;
+# previews are re-requested for drafts that did not change.
+BATCH_CACHE_BYTES = 8 * 1024 * 1024
+
+# Documents sent to a worker per task, so pickling and scheduling are paid
+# per chunk rather than per document.
+CHUNK_DOCUMENTS = 32
+
+# Chunks submitted per worker before the input stops being read, so a long
+# or endless iterable is never pulled into memory all at once.
+PENDING_PER_WORKER = 2
+
+
+def convert(markdown):
+    # Preview-sized documents convert faster as a plain tree than through
+    # the lazy block pipeline the site build uses for large pages.
+    return markdown_to_html_node(markdown).to_html()
+
+
+class DocumentCache:
+    # HTML of whole documents keyed by their markdown, least recently used
+    # evicted first. Keying on the string itself is cheap: Python keeps a
+    # string's hash once computed.
+    def __init__(self, max_bytes=BATCH_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return (
+            f"DocumentCache({len(self.entries)} entries, {self.bytes}/{self.max_bytes} bytes, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, markdown):
+        entry = self.entries.get(markdown)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(markdown)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, markdown, html):
+        size = sys.getsizeof(markdown) + sys.getsizeof(html)
+        if size > self.max_bytes or markdown in self.entries:
+            return
+        self.entries[markdown] = (html, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def convert(self, markdown):
+        html = self.get(markdown)
+        if html is None:
+            html = convert(markdown)
+            self.put(markdown, html)
+        return html
+
+
+def convert_many(
+    documents,
+    cache=None,
+    cache_bytes=BATCH_CACHE_BYTES,
+    inline_cache_bytes=0,
+    executor=None,
+    workers=None,
+    chunksize=CHUNK_DOCUMENTS,
+):
+    # Yields the HTML of each markdown document in input order. cache, a
+    # DocumentCache, carries converted documents over between calls;
+    # otherwise one of cache_bytes lives for this call. inline_cache_bytes
+    # also memoizes inline fragments between documents.
+    #
+    # With executor, a ProcessPoolExecutor, or workers > 1, documents are
+    # converted in chunks by worker processes, each of which keeps its own
+    # caches across chunks and calls.
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+    if executor is None and (workers is None or workers <= 1):
+        if cache is None and cache_bytes:
+            cache = DocumentCache(cache_bytes)
+        return _convert_serial(documents, cache, inline_cache_bytes)
+    if executor is not None and not _is_process_pool(executor):
+        # The pipeline's hooks, the inline cache among them, are process-wide
+        # state; threads would share and race on them.
+        raise ValueError("convert_many needs a ProcessPoolExecutor")
+    return _convert_parallel(
+        documents, cache_bytes, inline_cache_bytes, executor, workers, chunksize
+    )
+
+
+def _is_process_pool(executor):
+    from concurrent.futures import ProcessPoolExecutor
+
+    return isinstance(executor, ProcessPoolExecutor)
+
+
+def _inline_cache(max_bytes):
+    if not max_bytes:
+        return None
+    from inline_cache import InlineCache
+
+    return InlineCache(max_bytes)
+
+
+def _convert_serial(documents, cache, inline_cache_bytes):
+    convert_document = cache.convert if cache is not None else convert
+    inline_cache = _inline_cache(inline_cache_bytes)
+    for index, markdown in enumerate(documents):
+        # Installed per document and restored before yielding, so whatever
+        # the caller converts between two results never sees this cache.
+        previous = use_inline_cache(inline_cache)
+        try:
+            html = convert_document(markdown)
+        except ValueError as e:
+            raise ValueError(f"document {index}: {e}") from e
+        finally:
+            use_inline_cache(previous)
+        yield html
+
+
+def _convert_parallel(documents, cache_bytes, inline_cache_bytes, executor, workers, chunksize):
+    owned = executor is None
+    if owned:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+    max_pending = (workers or os.cpu_count() or 1) * PENDING_PER_WORKER
+    pending = deque()
+    try:
+        for start, chunk in _chunks(documents, chunksize):
+            pending.append(
+                executor.submit(_convert_chunk, start, chunk, cache_bytes, inline_cache_bytes)
+            )
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Also reached when the caller stops iterating early.
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _chunks(documents, chunksize):
+    chunk = []
+    start = 0
+    for markdown in documents:
+        chunk.append(markdown)
+        if len(chunk) == chunksize:
+            yield start, chunk
+            start += chunksize
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+# Per worker process, kept while the pool lives.
+_worker_cache = None
+_worker_inline_cache = None
+
+
+def _convert_chunk(start, documents, cache_bytes, inline_cache_bytes):
+    global _worker_cache, _worker_inline_cache
+    if not cache_bytes:
+        _worker_cache = None
+    elif _worker_cache is None or _worker_cache.max_bytes != cache_bytes:
+        _worker_cache = DocumentCache(cache_bytes)
+    if not inline_cache_bytes:
+        _worker_inline_cache = None
+    elif _worker_inline_cache is None or _worker_inline_cache.max_bytes != inline_cache_bytes:
+        _worker_inline_cache = _inline_cache(inline_cache_bytes)
+    convert_document = _worker_cache.convert if _worker_cache is not None else convert
+    previous = use_inline_cache(_worker_inline_cache)
+    try:
+        results = []
+        for index, markdown in enumerate(documents, start):
+            try:
+                results.append(convert_document(markdown))
+            except ValueError as e:
+                raise ValueError(f"document {index}: {e}") from e
+        return results
+    finally:
+        use_inline_cache(previous)
@@ -0,0 +1,55 @@
+import functools
+
+
+TEXT_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+ATTRIBUTE_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
+class TagStrings(dict):
+    def __init__(self, template):
+        super().__init__()
+        self.template = template
+
+    def __missing__(self, tag):
+        text = self[tag] = self.template.format(tag)
+        return text
+
+
+# Plain subscripts on these are a C-level dict lookup on the hot path; a
+# missing tag is formatted once and kept.
+OPEN_TAGS = TagStrings("<{}>")
+CLOSE_TAGS = TagStrings("</{}>")
+
+
+def escape_text(text):
+    # Most text needs no escaping; three substring scans are much cheaper
+    # than running translate() over every value.
+    if "&" in text or "<" in text or ">" in text:
+        return text.translate(TEXT_ESCAPES)
+    return text
+
+
+def escape_attribute(value):
+    value = str(value)
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return value.translate(ATTRIBUTE_ESCAPES)
+    return value
+
+
+def attributes_to_html(items):
+    return "".join(f' {key}="{escape_attribute(value)}"' for key, value in items)
+
+
+def open_tag(tag, props=None):
+    if props:
+        return _open_tag_with_props(tag, tuple(props.items()))
+    return OPEN_TAGS[tag]
+
+
+@functools.lru_cache(maxsize=4096)
+def _open_tag_with_props(tag, items):
+    return f"<{tag}{attributes_to_html(items)}>"
+
+
+def close_tag(tag):
+    return CLOSE_TAGS[tag]
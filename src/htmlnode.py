@@ -1,48 +1,196 @@
+import sys
+
+from html_render import (
+    TEXT_ESCAPES,
+    OPEN_TAGS,
+    CLOSE_TAGS,
+    escape_text,
+    attributes_to_html,
+    open_tag,
+)
+
+VOID_ELEMENTS = frozenset(("img", "br", "hr", "input", "meta", "link"))
+
+# How many pieces ParentNode.iter_html gathers before yielding a chunk.
+FLUSH_PARTS = 512
+
+# Children of a node wider than this are checked for a flush every this many,
+# so a paragraph of thousands of leaves still streams in bounded chunks.
+FLUSH_EVERY = 64
+_FLUSH = object()
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
-        self.tag = tag
+        self.tag = sys.intern(tag) if tag else tag
         self.value = value
         self.children = children
-        self.props = props
+        self.props = props or None
         
     def to_html(self):
         raise NotImplementedError
+
+    def iter_html(self):
+        raise NotImplementedError
+
+    def write_html(self, sink):
+        write = sink.write
+        for chunk in self.iter_html():
+            write(chunk)
     
     def props_to_html(self):
         if not self.props:
             return ""
-        return " " + " ".join(f'{key}="{value}"' for key, value in self.props.items())       
+        return attributes_to_html(self.props.items())
         
     def __repr__(self):
         return f"HTMLNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
     
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag=tag, value=value, children=None,props=props)
         
     def to_html(self):
-        if self.value is None or len(self.value) == 0:
+        tag = self.tag
+        value = self.value
+        if tag in VOID_ELEMENTS:
+            return open_tag(tag, self.props)
+        if not value:
             raise ValueError("LeafNode must have a non-empty value")
             
-        if self.tag is None:
-            return self.value
+        if tag is None:
+            return escape_text(value)
             
-        props_str = self.props_to_html()
-        return f"<{self.tag}{props_str}>{self.value}</{self.tag}>"
+        if self.props:
+            return open_tag(tag, self.props) + escape_text(value) + CLOSE_TAGS[tag]
+        return OPEN_TAGS[tag] + escape_text(value) + CLOSE_TAGS[tag]
+
+    def iter_html(self):
+        yield self.to_html()
     
     
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag=tag, value=None, children=children, props=props)
         
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
+        self._check()
+        # Walk the tree with an explicit stack so deep pages never hit the
+        # recursion limit and no subtree string is built before it is emitted.
+        # Tags and leaf output are gathered into one list and flushed in
+        # batches, so long runs of leaves become a single join.
+        parts = [open_tag(self.tag, self.props)]
+        append = parts.append
+        stack = [(_serial_children(self), self.tag)]
+        while stack:
+            children, tag = stack[-1]
+            for child in children:
+                if type(child) is LeafNode:
+                    value = child.value
+                    child_tag = child.tag
+                    if value and not child.props and child_tag not in VOID_ELEMENTS:
+                        # Text and inline tags are most of a page; render and
+                        # escape them here instead of calling to_html().
+                        if "&" in value or "<" in value or ">" in value:
+                            value = value.translate(TEXT_ESCAPES)
+                        if child_tag is None:
+                            append(value)
+                        else:
+                            append(OPEN_TAGS[child_tag])
+                            append(value)
+                            append(CLOSE_TAGS[child_tag])
+                    else:
+                        append(child.to_html())
+                    continue
+                if isinstance(child, ParentNode):
+                    child._check()
+                    append(open_tag(child.tag, child.props))
+                    grandchildren = child.children
+                    if type(grandchildren) is list and len(grandchildren) <= FLUSH_EVERY:
+                        stack.append((iter(grandchildren), child.tag))
+                    else:
+                        stack.append((_serial_children(child), child.tag))
+                    break
+                if child is _FLUSH:
+                    if len(parts) >= FLUSH_PARTS:
+                        yield "".join(parts)
+                        parts.clear()
+                    continue
+                if parts:
+                    yield "".join(parts)
+                    parts.clear()
+                yield from child.iter_html()
+            else:
+                stack.pop()
+                append(CLOSE_TAGS[tag])
+                if len(parts) >= FLUSH_PARTS:
+                    yield "".join(parts)
+                    parts.clear()
+        yield "".join(parts)
+
+    def _iter_children(self):
+        return iter(self.children)
+
+    def _check(self):
         if self.tag is None or len(self.tag) == 0:
             raise ValueError("ParentNode must have a non-empty tag")
         if self.children is None or len(self.children) == 0:
             raise ValueError("ParentNode must have a children")
 
-        body = "".join(x.to_html() for x in self.children)                
-        return f"<{self.tag}>{"".join(body)}</{self.tag}>"
-    
-        
\ No newline at end of file
+
+def _serial_children(node):
+    # Wide nodes get a _FLUSH marker every FLUSH_EVERY children, where
+    # iter_html checks whether to yield; the markers are placed up front so
+    # walking the children stays a plain list iteration.
+    children = node.children
+    if type(children) is not list:
+        return _with_flushes(node._iter_children())
+    if len(children) <= FLUSH_EVERY:
+        return iter(children)
+    marked = []
+    for start in range(0, len(children), FLUSH_EVERY):
+        marked += children[start : start + FLUSH_EVERY]
+        marked.append(_FLUSH)
+    return iter(marked)
+
+
+def _with_flushes(children):
+    count = 0
+    for child in children:
+        yield child
+        count += 1
+        if count == FLUSH_EVERY:
+            count = 0
+            yield _FLUSH
+
+
+class LazyParentNode(ParentNode):
+    # children is an iterable that is only consumed while serializing, or a
+    # zero-argument callable returning one. A generator can be rendered once;
+    # pass a callable to render the node more than once. Whether there are
+    # any children is only known once the open tag is out, so an empty
+    # iterable renders as an empty element rather than raising.
+    __slots__ = ()
+
+    def _iter_children(self):
+        children = self.children
+        if callable(children):
+            children = children()
+        return iter(children)
+
+    def _check(self):
+        if self.tag is None or len(self.tag) == 0:
+            raise ValueError("ParentNode must have a non-empty tag")
+        if self.children is None:
+            raise ValueError("ParentNode must have a children")
+
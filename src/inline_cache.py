@@ -0,0 +1,92 @@
+import hashlib
+import sys
+from collections import OrderedDict
+
+from inline_markdown import text_to_textnodes, parse_inline
+
+
+# Rough fixed cost of one cache entry: the key, the OrderedDict slot and the
+# tuple holding the nodes.
+ENTRY_OVERHEAD = 200
+
+
+def content_key(kind, text):
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16, person=kind)
+    return digest.digest()
+
+
+def nodes_size(nodes):
+    size = sys.getsizeof(nodes)
+    for node in nodes:
+        size += sys.getsizeof(node)
+        children = getattr(node, "children", None)
+        if children:
+            size += nodes_size(children)
+        for value in (getattr(node, "text", None), getattr(node, "value", None), getattr(node, "url", None)):
+            if value is not None:
+                size += sys.getsizeof(value)
+        props = getattr(node, "props", None)
+        if props:
+            size += sys.getsizeof(props) + sum(sys.getsizeof(v) for v in props.values())
+    return size
+
+
+class InlineCache:
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return (
+            f"InlineCache({len(self.entries)} entries, {self.bytes}/{self.max_bytes} bytes, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def text_to_textnodes(self, text):
+        return self.get_or_parse(b"textnode", text, lambda: text_to_textnodes(text))
+
+    def text_to_children(self, text):
+        return self.get_or_parse(b"children", text, lambda: parse_inline(text))
+
+    def get_or_parse(self, kind, text, parse):
+        # The returned tuples are shared between every caller that asks for
+        # the same text, so callers must not mutate the nodes inside them.
+        key = content_key(kind, text)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        nodes = tuple(parse())
+        size = nodes_size(nodes) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return nodes
+        self.entries[key] = (nodes, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+        return nodes
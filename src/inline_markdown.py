@@ -1,19 +1,60 @@
+import bisect
 import re
+import unicodedata
+from enum import Enum
 
 from textnode import TextNode, TextType
 from htmlnode import HTMLNode, LeafNode, ParentNode
 
 
+INLINE_PATTERN = re.compile(
+    r"\*\*(?P<bold>.*?)\*\*"
+    r"|\*(?P<italic>[^*]+)\*"
+    r"|`(?P<code>[^`]*)`"
+    r"|!\[(?P<image_alt>[^\[\]]*)\]\((?P<image_url>[^\(\)]*)\)"
+    r"|(?<!!)\[(?P<link_text>[^\[\]]*)\]\((?P<link_url>[^\(\)]*)\)"
+)
+
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    nodes = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        start = match.start()
+        if start > position:
+            nodes.append(_plain_textnode(text[position:start]))
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "bold" or kind == "italic" or kind == "code":
+            value = match.group(kind)
+            if value != "":
+                nodes.append(TextNode(value, _DELIMITER_TYPES[kind]))
+        elif kind == "image_url":
+            nodes.append(
+                TextNode(match.group("image_alt"), TextType.IMAGE, match.group(kind))
+            )
+        else:
+            nodes.append(
+                TextNode(match.group("link_text"), TextType.LINK, match.group(kind))
+            )
+    if position < len(text):
+        nodes.append(_plain_textnode(text[position:]))
     return nodes
 
 
+_DELIMITER_TYPES = {
+    "bold": TextType.BOLD,
+    "italic": TextType.ITALIC,
+    "code": TextType.CODE,
+}
+
+
+def _plain_textnode(text):
+    if "*" in text or "`" in text:
+        raise ValueError("Invalid markdown, formatted section not closed")
+    return TextNode(text, TextType.TEXT)
+
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
     for old_node in old_nodes:
@@ -89,48 +130,440 @@ def split_nodes_link(old_nodes):
     return new_nodes
 
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return LINK_PATTERN.findall(text)
+
+
+# Tokens the nested parser stops at; everything between them is plain text.
+INLINE_TOKEN_PATTERN = re.compile(r"\*+|`+|!\[|\[|\]")
+BACKTICK_RUN_PATTERN = re.compile(r"`+")
+LINK_DESTINATION_PATTERN = re.compile(r"\(([^()]*)\)")
+# Links, images and emphasis whose text holds no further markup, which is
+# nearly all of them; these skip the bracket and delimiter stacks.
+SIMPLE_LINK_PATTERN = re.compile(r"(!?)\[([^\[\]*`!]+)\]\(([^()]*)\)")
+SIMPLE_EMPHASIS_PATTERN = re.compile(r"(\*\*?)([^*`\[\]!]+)\1(?!\*)")
+
+
+def parse_inline(text):
+    # Returns HTMLNode children with emphasis, links and images nested as
+    # written. Delimiters that never close are kept as literal text.
+    return _InlineParser(text).parse()
+
+
+class _Item:
+    # One entry in the doubly linked list of parsed pieces: a str of plain
+    # text (or of not yet matched delimiters) or a finished HTMLNode.
+    __slots__ = ("value", "prev", "next")
+
+    def __init__(self, value):
+        self.value = value
+        self.prev = None
+        self.next = None
+
+
+class _Delimiter:
+    __slots__ = ("item", "count", "length", "can_open", "can_close", "previous", "next")
+
+    def __init__(self, item, can_open, can_close, previous):
+        self.item = item
+        self.count = self.length = len(item.value)
+        self.can_open = can_open
+        self.can_close = can_close
+        self.previous = previous
+        self.next = None
+
+
+class _Bracket:
+    __slots__ = ("item", "start", "image", "delimiter")
+
+    def __init__(self, item, start, image, delimiter):
+        self.item = item
+        self.start = start
+        self.image = image
+        # Top of the delimiter stack when the bracket opened; emphasis inside
+        # the link text is resolved down to here and no further.
+        self.delimiter = delimiter
+
+
+class _InlineParser:
+    def __init__(self, text):
+        self.text = text
+        self.head = _Item(None)
+        self.tail = self.head
+        self.delimiters = None
+        self.brackets = []
+        # Link openers below this index in brackets can no longer open a
+        # link; image openers are unaffected.
+        self.inactive = 0
+        self.backtick_runs = None
+
+    def parse(self):
+        text = self.text
+        position = 0
+        while True:
+            match = INLINE_TOKEN_PATTERN.search(text, position)
+            if match is None:
+                self.append(text[position:])
+                break
+            start = match.start()
+            if start > position:
+                self.append(text[position:start])
+            token = match.group()
+            position = match.end()
+            first = token[0]
+            if first == "*":
+                simple = self.delimiters is None and SIMPLE_EMPHASIS_PATTERN.match(text, start)
+                if simple and self.simple_emphasis(simple):
+                    position = simple.end()
+                    continue
+                self.push_delimiter(token, start, position)
+            elif first == "`":
+                position = self.code_span(token, position)
+            elif first == "]":
+                position = self.close_bracket(position)
+            else:
+                simple = SIMPLE_LINK_PATTERN.match(text, start)
+                if simple is not None:
+                    self.simple_link(simple)
+                    position = simple.end()
+                    continue
+                item = self.append(token)
+                self.brackets.append(_Bracket(item, start, first == "!", self.delimiters))
+        self.process_emphasis(None)
+        return _collect(self.head.next, None)
+
+    def append(self, value):
+        item = _Item(value)
+        item.prev = self.tail
+        self.tail.next = item
+        self.tail = item
+        return item
+
+    def simple_link(self, match):
+        image, label, url = match.groups()
+        if image:
+            self.append(LeafNode("img", "", {"src": url, "alt": label}))
+            return
+        self.append(LeafNode("a", label, {"href": url}))
+        self.inactive = len(self.brackets)
+
+    def simple_emphasis(self, match):
+        # Only taken with no opener pending, so nothing earlier can claim
+        # either run; the flanking rules still decide if it is emphasis.
+        run = match.group(1)
+        start, end = match.span()
+        can_open, _ = self.flanking(start, start + len(run))
+        _, can_close = self.flanking(end - len(run), end)
+        if not can_open or not can_close:
+            return False
+        self.append(LeafNode("b" if len(run) == 2 else "i", match.group(2)))
+        return True
+
+    def flanking(self, start, end):
+        text = self.text
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        # CommonMark flanking rules: a run can open emphasis when it is not
+        # followed by whitespace, and not followed by punctuation unless it
+        # also comes after whitespace or punctuation. Closing mirrors this.
+        can_open = not after.isspace() and (
+            not _is_punctuation(after) or before.isspace() or _is_punctuation(before)
+        )
+        can_close = not before.isspace() and (
+            not _is_punctuation(before) or after.isspace() or _is_punctuation(after)
+        )
+        return can_open, can_close
+
+    def push_delimiter(self, run, start, end):
+        can_open, can_close = self.flanking(start, end)
+        item = self.append(run)
+        if can_open or can_close:
+            delimiter = _Delimiter(item, can_open, can_close, self.delimiters)
+            if self.delimiters is not None:
+                self.delimiters.next = delimiter
+            self.delimiters = delimiter
+
+    def code_span(self, run, position):
+        # A code span closes at the next backtick run of exactly the same
+        # length. The runs are indexed once per text, so unmatched openers do
+        # not rescan the rest of the line.
+        if self.backtick_runs is None:
+            self.backtick_runs = {}
+            for match in BACKTICK_RUN_PATTERN.finditer(self.text):
+                self.backtick_runs.setdefault(len(match.group()), []).append(match.start())
+        starts = self.backtick_runs[len(run)]
+        index = bisect.bisect_left(starts, position)
+        if index == len(starts):
+            self.append(run)
+            return position
+        end = starts[index]
+        code = self.text[position:end]
+        if len(code) > 1 and code[0] == " " and code[-1] == " " and code.strip(" "):
+            code = code[1:-1]
+        if code:
+            self.append(LeafNode("code", code))
+        return end + len(run)
+
+    def close_bracket(self, position):
+        brackets = self.brackets
+        opener = brackets.pop() if brackets else None
+        active = opener is not None and (opener.image or len(brackets) >= self.inactive)
+        self.inactive = min(self.inactive, len(brackets))
+        match = LINK_DESTINATION_PATTERN.match(self.text, position)
+        if not active or match is None:
+            self.append("]")
+            return position
+        url = match.group(1)
+        self.process_emphasis(opener.delimiter)
+        children = _collect(opener.item.next, None)
+        if opener.image:
+            node = LeafNode("img", "", {"src": url, "alt": plain_text(children)})
+        elif not children and not url:
+            # Nothing to show and nowhere to go: keep the source as written.
+            node = LeafNode(None, self.text[opener.start : match.end()])
+        else:
+            # Our nodes cannot render an empty <a>, so fall back to the URL.
+            node = ParentNode("a", children or [LeafNode(None, url)], {"href": url})
+            # Links may not contain links: earlier [ can no longer open one.
+            self.inactive = len(brackets)
+        item = _Item(node)
+        item.prev = opener.item.prev
+        item.prev.next = item
+        self.tail = item
+        return match.end()
+
+    def process_emphasis(self, bottom):
+        closer = self.delimiters
+        while closer is not None and closer.previous is not bottom:
+            closer = closer.previous
+        # Where the search for an opener may stop, per kind of closer, so a
+        # long run of unmatched delimiters is only scanned once.
+        openers_bottom = {}
+        while closer is not None:
+            if not closer.can_close:
+                closer = closer.next
+                continue
+            key = (closer.can_open, closer.length % 3)
+            stop = openers_bottom.get(key, bottom)
+            opener = closer.previous
+            while opener is not None and opener is not bottom and opener is not stop:
+                # The "rule of three" keeps *foo**bar* from pairing the
+                # single and double runs with each other.
+                odd = (
+                    (closer.can_open or opener.can_close)
+                    and closer.length % 3 != 0
+                    and (opener.length + closer.length) % 3 == 0
+                )
+                if opener.can_open and not odd:
+                    break
+                opener = opener.previous
+            else:
+                opener = None
+            if opener is None:
+                openers_bottom[key] = closer.previous
+                following = closer.next
+                if not closer.can_open:
+                    self.remove_delimiter(closer)
+                closer = following
+                continue
+
+            use = 2 if opener.count >= 2 and closer.count >= 2 else 1
+            opener.count -= use
+            closer.count -= use
+            opener.item.value = opener.item.value[use:]
+            closer.item.value = closer.item.value[use:]
+            children = _collect(opener.item.next, closer.item)
+            node = _Item(ParentNode("b" if use == 2 else "i", children))
+            node.prev = opener.item
+            node.next = closer.item
+            opener.item.next = node
+            closer.item.prev = node
+            opener.next = closer
+            closer.previous = opener
+            if opener.count == 0:
+                self.remove_item(opener.item)
+                self.remove_delimiter(opener)
+            if closer.count == 0:
+                following = closer.next
+                self.remove_item(closer.item)
+                self.remove_delimiter(closer)
+                closer = following
+
+        while self.delimiters is not None and self.delimiters is not bottom:
+            self.remove_delimiter(self.delimiters)
+
+    def remove_item(self, item):
+        item.prev.next = item.next
+        if item.next is not None:
+            item.next.prev = item.prev
+        else:
+            self.tail = item.prev
+
+    def remove_delimiter(self, delimiter):
+        if delimiter.previous is not None:
+            delimiter.previous.next = delimiter.next
+        if delimiter.next is not None:
+            delimiter.next.previous = delimiter.previous
+        else:
+            self.delimiters = delimiter.previous
+
+
+def _collect(item, end):
+    # Turns the items from item up to (not including) end into nodes, joining
+    # neighbouring text into a single LeafNode.
+    nodes = []
+    text = []
+    while item is not end:
+        value = item.value
+        if type(value) is str:
+            text.append(value)
+        else:
+            if text:
+                joined = "".join(text)
+                if joined:
+                    nodes.append(LeafNode(None, joined))
+                text.clear()
+            nodes.append(value)
+        item = item.next
+    if text:
+        joined = "".join(text)
+        if joined:
+            nodes.append(LeafNode(None, joined))
+    return nodes
+
+
+def plain_text(nodes, separator=""):
+    # The text a reader sees in nodes, image alt text included.
+    parts = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if node.children is not None:
+            stack.extend(reversed(node.children))
+        elif node.value:
+            parts.append(node.value)
+        elif node.tag == "img":
+            parts.append(node.props["alt"])
+    return separator.join(parts)
+
+
+def _is_punctuation(char):
+    return unicodedata.category(char)[0] in "PS"
 
 
 def markdown_to_blocks(markdown):
-    markdown_c = markdown
-    md_list = markdown_c.split("\n")
-    newMdList = [x.strip() for x in md_list]
-    return newMdList
+    return list(iter_blocks(markdown.split("\n")))
+
+
+HEADING_LINE_PATTERN = re.compile(r"#{1,6} ")
+
+
+def iter_blocks(lines):
+    block = []
+    fence = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if fence is not None:
+            # Inside a fenced code block lines keep their indentation and
+            # blank lines do not end the block.
+            block.append(line)
+            if stripped.startswith(fence):
+                yield "\n".join(block)
+                block = []
+                fence = None
+            continue
+        if stripped == "":
+            if block:
+                yield "\n".join(block)
+                block = []
+            continue
+        if stripped.startswith("```"):
+            if block:
+                yield "\n".join(block)
+            block = [stripped]
+            if len(stripped) >= 6 and stripped.endswith("```"):
+                yield stripped
+                block = []
+            else:
+                fence = "```"
+            continue
+        if HEADING_LINE_PATTERN.match(stripped):
+            if block:
+                yield "\n".join(block)
+                block = []
+            yield stripped
+            continue
+        block.append(stripped)
+    if block:
+        yield "\n".join(block)
+
+
+class BlockType(Enum):
+    PARAGRAPH = "paragraph"
+    HEADING = "heading"
+    CODE = "code"
+    QUOTE = "quote"
+    UNORDERED_LIST = "unordered_list"
+    ORDERED_LIST = "ordered_list"
+
 
 def block_to_block_type(markdown_block):
-    blocks = {
-        0: "paragraph",
-        1: "heading",
-        2: "code",
-        3: "quote",
-        4: "unordered_list",
-        5: "ordered_list"
-    }
-    parts = markdown_block.split(" ")
-    if bool(re.match(r"^#{1,6}", parts[0])):
-        return blocks[1]
-    elif bool(re.match(r"^`{3}", parts[0])):
-        if len(parts) == 1:
-            if bool(re.match(r"`{3}", parts[0])):
-                return blocks[2]
-        else:
-            if bool(re.match(r"`{3}", parts[-1][-3:])):
-                return blocks[2]
-    elif bool(re.match("^>",parts[0])):
-        return blocks[3]
-    elif bool(re.match("^\*",parts[0])):
-        return blocks[4]
-    elif bool(re.match("^\d+\.$", parts[0])):
-        return blocks[5]
-    else:
-        return blocks[0]
+    classify = BLOCK_CLASSIFIERS.get(markdown_block[:1])
+    if classify is None:
+        return BlockType.PARAGRAPH
+    return classify(markdown_block)
+
+
+def _classify_heading(block):
+    if HEADING_LINE_PATTERN.match(block) and "\n" not in block:
+        return BlockType.HEADING
+    return BlockType.PARAGRAPH
+
+
+def _classify_code(block):
+    if len(block) >= 6 and block.startswith("```") and block.endswith("```"):
+        return BlockType.CODE
+    return BlockType.PARAGRAPH
+
+
+def _classify_quote(block):
+    for line in block.split("\n"):
+        if not line.startswith(">"):
+            return BlockType.PARAGRAPH
+    return BlockType.QUOTE
+
+
+def _classify_unordered_list(block):
+    for line in block.split("\n"):
+        if not (line.startswith("* ") or line.startswith("- ")):
+            return BlockType.PARAGRAPH
+    return BlockType.UNORDERED_LIST
+
+
+def _classify_ordered_list(block):
+    number = 1
+    for line in block.split("\n"):
+        prefix = f"{number}. "
+        if not line.startswith(prefix):
+            return BlockType.PARAGRAPH
+        number += 1
+    return BlockType.ORDERED_LIST
+
+
+BLOCK_CLASSIFIERS = {
+    "#": _classify_heading,
+    "`": _classify_code,
+    ">": _classify_quote,
+    "*": _classify_unordered_list,
+    "-": _classify_unordered_list,
+    "1": _classify_ordered_list,
+}
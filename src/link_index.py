@@ -0,0 +1,112 @@
+import posixpath
+from urllib.parse import unquote, urlsplit
+
+
+class PageLinks:
+    # Link and image targets of one page, recorded while its inline markup
+    # is converted.
+    __slots__ = ("links", "images")
+
+    def __init__(self):
+        self.links = []
+        self.images = []
+
+    def __repr__(self):
+        return f"PageLinks({len(self.links)} links, {len(self.images)} images)"
+
+    def record(self, nodes):
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node.children is not None:
+                if node.tag == "a":
+                    self.links.append(node.props["href"])
+                stack.extend(node.children)
+            elif node.tag == "a":
+                self.links.append(node.props["href"])
+            elif node.tag == "img":
+                self.images.append(node.props["src"])
+
+    def extend(self, other):
+        self.links.extend(other.links)
+        self.images.extend(other.images)
+
+    def as_dict(self):
+        return {"links": self.links, "images": self.images}
+
+
+def resolve_url(page_output, url):
+    # Maps a link found on page_output (a path such as "blog/post.html") to
+    # the site path it points at, or None for external and in-page links.
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = unquote(parts.path)
+    if path.startswith("/"):
+        path = path.lstrip("/")
+    else:
+        path = posixpath.join(posixpath.dirname(page_output), path)
+    trailing = path.endswith("/") or path == ""
+    path = posixpath.normpath(path) if path else ""
+    if path.startswith(".."):
+        return path
+    if trailing or path == ".":
+        return posixpath.join("" if path == "." else path, "index.html")
+    return path
+
+
+def _candidates(target):
+    # A link to /docs may be served as docs.html or docs/index.html.
+    yield target
+    if not posixpath.splitext(target)[1]:
+        yield target + ".html"
+        yield posixpath.join(target, "index.html")
+
+
+class LinkIndex:
+    def __init__(self):
+        # source page output -> {"links": [...], "images": [...]}
+        self.pages = {}
+
+    def __repr__(self):
+        return f"LinkIndex({len(self.pages)} pages)"
+
+    def add(self, page_output, links):
+        self.pages[page_output] = links
+
+    def targets(self, page_output, kind="links"):
+        entry = self.pages.get(page_output)
+        if entry is None:
+            return []
+        resolved = []
+        for url in entry[kind]:
+            target = resolve_url(page_output, url)
+            if target is not None:
+                resolved.append(target)
+        return resolved
+
+    def broken(self, known):
+        # known holds every path the build publishes. Returns
+        # (page, url, kind) for each internal target that is not among them.
+        found = []
+        for page_output in sorted(self.pages):
+            entry = self.pages[page_output]
+            for kind in ("links", "images"):
+                for url in entry[kind]:
+                    target = resolve_url(page_output, url)
+                    if target is None:
+                        continue
+                    if not any(candidate in known for candidate in _candidates(target)):
+                        found.append((page_output, url, kind))
+        return found
+
+    def backlinks(self, known=None):
+        # target page -> sorted pages linking to it.
+        result = {}
+        for page_output in self.pages:
+            for target in self.targets(page_output):
+                if known is not None:
+                    target = next((c for c in _candidates(target) if c in known), target)
+                sources = result.setdefault(target, set())
+                sources.add(page_output)
+        return {target: sorted(sources) for target, sources in sorted(result.items())}
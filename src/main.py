@@ -1,9 +1,215 @@
-from textnode import TextNode, TextType
+import argparse
+import json
+import os
+import sys
 
+from build import build_site
 
-def main():
-    node = TextNode("This is a text node", TextType.BOLD, "https://www.boot.dev")
-    print(node)
 
+# Used as the layout when --template is not given and this file exists in the
+# working directory; otherwise pages use the built-in layout.
+DEFAULT_TEMPLATE_PATH = "template.html"
 
-main()
\ No newline at end of file
+
+def main(argv=None):
+    site_options = argparse.ArgumentParser(add_help=False)
+    site_options.add_argument("--content", default="content", help="markdown source directory")
+    site_options.add_argument("--public", default="public", help="output directory")
+    site_options.add_argument(
+        "--template",
+        default=None,
+        help=f"page layout (default: {DEFAULT_TEMPLATE_PATH} if present, else a built-in one)",
+    )
+    site_options.add_argument(
+        "--static",
+        default="static",
+        help="directory mirrored into the output as-is",
+    )
+    site_options.add_argument(
+        "--hash-assets",
+        action="store_true",
+        help="publish static files under content-hashed names and rewrite references",
+    )
+    site_options.add_argument(
+        "--link-assets",
+        action="store_true",
+        help="hard-link static files into the output instead of copying",
+    )
+    site_options.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="page render processes (default: CPU count, 1 renders serially)",
+    )
+    site_options.add_argument(
+        "--cache-dir",
+        default=".cache",
+        help="where the incremental build manifest is kept",
+    )
+    site_options.add_argument(
+        "--force",
+        action="store_true",
+        help="ignore the build cache and render every page",
+    )
+    site_options.add_argument(
+        "--inline-cache-mb",
+        type=float,
+        default=0,
+        help="memoize repeated inline fragments per render process (0 disables)",
+    )
+    site_options.add_argument(
+        "--search",
+        action="store_true",
+        help="also write a client-side search index into the output",
+    )
+    site_options.add_argument(
+        "--check-links",
+        action="store_true",
+        help="list links and images pointing at missing pages or files, and fail if any",
+    )
+    site_options.add_argument(
+        "--links-json",
+        default=None,
+        metavar="PATH",
+        help="write the link index, backlinks and broken links as JSON",
+    )
+    site_options.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.json",
+        default=None,
+        metavar="PATH",
+        help="time every pipeline stage per page and write a JSON report (default: profile.json)",
+    )
+    site_options.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="how many of the slowest pages to list with --profile",
+    )
+    site_options.add_argument(
+        "--pstats",
+        default=None,
+        metavar="PATH",
+        help="also dump cProfile stats here (renders serially)",
+    )
+
+    parser = argparse.ArgumentParser(prog="main.py")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("build", parents=[site_options], help="render content/ into public/")
+    serve_parser = commands.add_parser(
+        "serve", parents=[site_options], help="build, then serve public/ over HTTP"
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8888)
+    serve_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="re-render edited pages and live-reload the browser",
+    )
+
+    if argv is None:
+        argv = sys.argv[1:]
+    args = parser.parse_args(argv or ["build"])
+    if args.template is None:
+        if os.path.isfile(DEFAULT_TEMPLATE_PATH):
+            args.template = DEFAULT_TEMPLATE_PATH
+    elif not os.path.isfile(args.template):
+        print(f"Template not found: {args.template}", file=sys.stderr)
+        return 1
+
+    profiler = None
+    if args.pstats:
+        import cProfile
+
+        # cProfile only sees the current process, so render serially.
+        args.workers = 1
+        profiler = cProfile.Profile()
+        profiler.enable()
+    report = build_site(
+        args.content,
+        args.public,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+        force=args.force,
+        inline_cache_bytes=int(args.inline_cache_mb * 1024 * 1024),
+        profile=args.profile is not None,
+        template_path=args.template,
+        static_dir=args.static,
+        hash_assets=args.hash_assets,
+        link_assets=args.link_assets,
+        search=args.search,
+    )
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.pstats)
+    print(
+        f"Built {len(report.written)} pages into {args.public} "
+        f"({len(report.unchanged) + len(report.skipped)} unchanged, {len(report.removed)} removed)"
+    )
+    if report.assets is not None:
+        assets = report.assets
+        print(
+            f"Static: {len(assets.copied)} copied, {len(assets.skipped)} unchanged, "
+            f"{len(assets.removed)} removed"
+        )
+    if report.search is not None:
+        search = report.search
+        print(
+            f"Search index: {search['pages']} pages, {len(search['written'])} files written, "
+            f"{len(search['removed'])} removed"
+        )
+    if report.inline_cache is not None:
+        stats = report.inline_cache
+        print(
+            f"Inline cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['evictions']} evictions, {stats['bytes']} bytes"
+        )
+    if report.profile is not None:
+        import profiling
+
+        profiling.write_report(args.profile, report.profile)
+        print(profiling.format_top_pages(report.profile, args.profile_top))
+        print(f"Profile written to {args.profile}")
+
+    if args.links_json:
+        links = report.links
+        with open(args.links_json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "pages": links.pages,
+                    "backlinks": links.backlinks(),
+                    "broken": [list(entry) for entry in report.broken_links],
+                },
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+    if args.check_links:
+        for page, url, kind in report.broken_links:
+            print(f"{page}: broken {kind[:-1]} {url}")
+        if report.broken_links:
+            print(f"{len(report.broken_links)} broken links")
+            return 1
+
+    if args.command == "serve":
+        from serve import serve
+
+        serve(
+            args.content,
+            args.public,
+            args.host,
+            args.port,
+            watch=args.watch,
+            template_path=args.template,
+            static_dir=args.static,
+            hash_assets=args.hash_assets,
+            link_assets=args.link_assets,
+            cache_dir=args.cache_dir,
+            asset_urls=report.assets.urls() if report.assets is not None else None,
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+import struct
+import sys
+from array import array
+
+from htmlnode import HTMLNode, LeafNode, ParentNode, LazyParentNode
+from textnode import TextNode, TextType
+
+
+# A packed tree is a flat int32 array of (kind, tag-id, text-offset, length,
+# parent-index) records plus one shared string buffer and a small table of
+# tag/type names. Nodes appear in pre-order, so a parent always precedes its
+# children and children keep their order.
+KIND_TEXT = 0
+KIND_LEAF = 1
+KIND_PARENT = 2
+KIND_ATTR = 3
+RECORD_SIZE = 5
+
+NO_PARENT = -1
+NO_TAG = -1
+NO_VALUE = -1
+
+MAGIC = b"SSGN"
+VERSION = 1
+HEADER = struct.Struct("<4sBIII")
+
+_TEXT_TYPES = {text_type.value: text_type for text_type in TextType}
+
+
+class PackedNodes:
+    __slots__ = ("records", "names", "text")
+
+    def __init__(self, records, names, text):
+        self.records = records
+        self.names = names
+        self.text = text
+
+    def __len__(self):
+        return len(self.records) // RECORD_SIZE
+
+    def __eq__(self, other):
+        return (
+            self.records == other.records
+            and self.names == other.names
+            and self.text == other.text
+        )
+
+    def __repr__(self):
+        return f"PackedNodes({len(self)} records, {len(self.names)} names, {len(self.text)} chars)"
+
+    def __reduce__(self):
+        # Pickle as one bytes object rather than as three Python objects.
+        return (PackedNodes.from_bytes, (self.to_bytes(),))
+
+    def to_bytes(self):
+        names = "\0".join(self.names).encode("utf-8")
+        text = self.text.encode("utf-8")
+        records = self.records
+        if sys.byteorder != "little":
+            records = array("i", records)
+            records.byteswap()
+        header = HEADER.pack(MAGIC, VERSION, len(names), len(text), len(self.records))
+        return b"".join((header, names, text, records.tobytes()))
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("Invalid packed node data")
+        magic, version, names_size, text_size, record_count = HEADER.unpack_from(data)
+        records = array("i")
+        size = HEADER.size + names_size + text_size + record_count * records.itemsize
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or record_count % RECORD_SIZE
+            or len(data) != size
+        ):
+            raise ValueError("Invalid packed node data")
+        offset = HEADER.size
+        names = data[offset:offset + names_size].decode("utf-8")
+        offset += names_size
+        text = data[offset:offset + text_size].decode("utf-8")
+        offset += text_size
+        records.frombytes(data[offset:offset + record_count * records.itemsize])
+        if sys.byteorder != "little":
+            records.byteswap()
+        return cls(records, names.split("\0") if names_size else [], text)
+
+
+class _Packer:
+    def __init__(self):
+        self.records = array("i")
+        self.names = []
+        self.name_ids = {}
+        self.pieces = []
+        self.offset = 0
+        self.count = 0
+
+    def name(self, name):
+        if name is None:
+            return NO_TAG
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def add(self, kind, name, text, parent):
+        if text is None:
+            offset, length = 0, NO_VALUE
+        else:
+            offset, length = self.offset, len(text)
+            self.pieces.append(text)
+            self.offset += length
+        self.records.extend((kind, self.name(name), offset, length, parent))
+        self.count += 1
+        return self.count - 1
+
+    def add_props(self, props, owner):
+        if props:
+            for key, value in props.items():
+                self.add(KIND_ATTR, key, str(value), owner)
+
+    def finish(self):
+        return PackedNodes(self.records, self.names, "".join(self.pieces))
+
+
+def pack_textnodes(nodes):
+    packer = _Packer()
+    for node in nodes:
+        index = packer.add(KIND_TEXT, node.text_type.value, node.text, NO_PARENT)
+        if node.url is not None:
+            packer.add(KIND_ATTR, "url", node.url, index)
+    return packer.finish()
+
+
+def pack_html(root):
+    packer = _Packer()
+    stack = [(root, NO_PARENT)]
+    while stack:
+        node, parent = stack.pop()
+        if isinstance(node, ParentNode):
+            children = list(node._iter_children())
+            index = packer.add(KIND_PARENT, node.tag, None, parent)
+            packer.add_props(node.props, index)
+            stack.extend((child, index) for child in reversed(children))
+        elif isinstance(node, LeafNode):
+            index = packer.add(KIND_LEAF, node.tag, node.value, parent)
+            packer.add_props(node.props, index)
+        else:
+            raise ValueError(f"Cannot pack node: {node!r}")
+    return packer.finish()
+
+
+def unpack(packed):
+    names = packed.names
+    text = packed.text
+    nodes = []
+    roots = []
+    fields = iter(packed.records)
+    for kind, name_id, offset, length, parent in zip(fields, fields, fields, fields, fields):
+        # Negative ids would index from the end; ids past the end and parents
+        # at or after their child fail the lookups below.
+        if name_id < NO_TAG or parent < NO_PARENT:
+            raise ValueError(f"Invalid packed record {len(nodes)}")
+        try:
+            name = None if name_id == NO_TAG else names[name_id]
+        except IndexError:
+            raise ValueError(f"Invalid packed name id: {name_id}") from None
+        value = None if length == NO_VALUE else text[offset:offset + length]
+        if kind == KIND_ATTR:
+            owner = nodes[parent] if NO_PARENT < parent < len(nodes) else None
+            if owner is None:
+                raise ValueError(f"Invalid packed attribute owner: {parent}")
+            if isinstance(owner, TextNode):
+                owner.url = value
+            elif owner.props is None:
+                owner.props = {name: value}
+            else:
+                owner.props[name] = value
+            nodes.append(None)
+            continue
+        if kind == KIND_TEXT:
+            text_type = _TEXT_TYPES.get(name)
+            if text_type is None:
+                raise ValueError(f"Invalid packed text type: {name}")
+            node = TextNode(value, text_type)
+        elif kind == KIND_LEAF:
+            node = LeafNode(name, value)
+        elif kind == KIND_PARENT:
+            # Lazy so that an element packed without children, such as an
+            # empty quote or code block, renders empty as it did before.
+            node = LazyParentNode(name, [])
+        else:
+            raise ValueError(f"Invalid packed node kind: {kind}")
+        if parent == NO_PARENT:
+            roots.append(node)
+        else:
+            # Only an element has a children list to append to.
+            try:
+                nodes[parent].children.append(node)
+            except (IndexError, AttributeError):
+                raise ValueError(f"Invalid packed parent: {parent}") from None
+        nodes.append(node)
+    return roots
+
+
+def unpack_textnodes(packed):
+    return unpack(packed)
+
+
+def unpack_html(packed):
+    roots = unpack(packed)
+    if len(roots) != 1 or not isinstance(roots[0], HTMLNode):
+        raise ValueError("Packed data does not hold a single HTMLNode tree")
+    return roots[0]
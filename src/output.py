@@ -0,0 +1,92 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# How many writes may be queued per worker thread before submit() blocks, so
+# a fast renderer cannot pile every page of a large site up in memory.
+PENDING_PER_WORKER = 4
+
+
+def write_if_changed(path, data):
+    # Compare against what is already there: size first, which settles most
+    # changed files with one stat, then the bytes themselves. Identical output
+    # is left alone so its mtime, and everything keyed on it downstream
+    # (rsync, CDN uploads, ETags), stays put.
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
+        size = None
+    if size == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Readers never see a half-written page: the new content goes to a
+    # temporary file in the same directory and is renamed over the old one.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+class OutputWriter:
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = min(8, (os.cpu_count() or 1) + 2)
+        self.workers = workers
+        self.written = []
+        self.unchanged = []
+        self.removed = []
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.pending = threading.BoundedSemaphore(workers * PENDING_PER_WORKER)
+        self.futures = []
+
+    def __repr__(self):
+        return (
+            f"OutputWriter(written={len(self.written)}, "
+            f"unchanged={len(self.unchanged)}, removed={len(self.removed)})"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, path, text):
+        self.pending.acquire()
+        try:
+            future = self.pool.submit(self._write, path, text)
+        except BaseException:
+            self.pending.release()
+            raise
+        self.futures.append((path, future))
+
+    def _write(self, path, text):
+        try:
+            return write_if_changed(path, text.encode("utf-8"))
+        finally:
+            self.pending.release()
+
+    def remove(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+            self.removed.append(path)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        futures, self.futures = self.futures, []
+        # Results are collected in submission order so the report does not
+        # depend on which thread finished first.
+        for path, future in futures:
+            if future.result():
+                self.written.append(path)
+            else:
+                self.unchanged.append(path)
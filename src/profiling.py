@@ -0,0 +1,162 @@
+import functools
+import importlib
+import inspect
+import json
+import time
+
+
+# (module, attribute, stage). Probes are only installed by enable(), so a
+# normal build runs the original functions with no timing overhead at all.
+# Call sites bind these names at import time, which is why the same function
+# is listed once per module that uses it.
+PROBES = (
+    ("build", "iter_blocks", "blocks.split"),
+    ("block_markdown", "markdown_to_blocks", "blocks.split"),
+    ("block_markdown", "block_to_block_type", "blocks.classify"),
+    ("block_markdown", "parse_inline", "inline.parse"),
+    ("inline_cache", "parse_inline", "inline.parse"),
+    ("inline_cache", "text_to_textnodes", "inline.parse"),
+    ("inline_markdown", "split_nodes_delimiter", "inline.split_delimiter"),
+    ("inline_markdown", "extract_markdown_images", "inline.extract_images"),
+    ("inline_markdown", "extract_markdown_links", "inline.extract_links"),
+    ("htmlnode", "ParentNode.to_html", "html.to_html"),
+)
+
+_installed = []
+_page = None
+
+
+class PageProfile:
+    def __init__(self, page):
+        self.page = page
+        self.stages = {}
+        self.counters = {}
+        self.total = 0.0
+
+    def add(self, stage, seconds, count=1):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [seconds, count]
+        else:
+            entry[0] += seconds
+            entry[1] += count
+
+    def count(self, name, amount):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def as_dict(self):
+        return {
+            "page": self.page,
+            "seconds": self.total,
+            "stages": {name: {"seconds": s, "calls": c} for name, (s, c) in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+
+def enabled():
+    return bool(_installed)
+
+
+def enable():
+    if _installed:
+        return
+    for module_name, attribute, stage in PROBES:
+        target = importlib.import_module(module_name)
+        owner_name, _, name = attribute.rpartition(".")
+        if owner_name:
+            target = getattr(target, owner_name)
+        original = getattr(target, name)
+        if inspect.isgeneratorfunction(original):
+            wrapper = _probe_generator(stage, original)
+        else:
+            wrapper = _probe(stage, original)
+        setattr(target, name, wrapper)
+        _installed.append((target, name, original))
+
+
+def disable():
+    while _installed:
+        target, name, original = _installed.pop()
+        setattr(target, name, original)
+
+
+def _probe(stage, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _page is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        _page.add(stage, time.perf_counter() - start)
+        if stage == "inline.parse":
+            _page.count("nodes.text", len(result))
+        elif stage == "html.to_html":
+            _page.count("html.bytes", len(result))
+        return result
+    return wrapper
+
+
+def _probe_generator(stage, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        iterator = func(*args, **kwargs)
+        if _page is not None:
+            _page.add(stage, 0.0)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                if _page is not None:
+                    _page.add(stage, time.perf_counter() - start, 0)
+                return
+            if _page is not None:
+                _page.add(stage, time.perf_counter() - start, 0)
+                _page.count("blocks", 1)
+            yield item
+    return wrapper
+
+
+def begin_page(page):
+    global _page
+    _page = PageProfile(page)
+    _page.total = time.perf_counter()
+
+
+def end_page():
+    global _page
+    profile, _page = _page, None
+    profile.total = time.perf_counter() - profile.total
+    return profile.as_dict()
+
+
+def aggregate(pages):
+    stages = {}
+    counters = {}
+    total = 0.0
+    for page in pages:
+        total += page["seconds"]
+        for name, stage in page["stages"].items():
+            entry = stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += stage["seconds"]
+            entry["calls"] += stage["calls"]
+        for name, amount in page["counters"].items():
+            counters[name] = counters.get(name, 0) + amount
+    return {"pages": len(pages), "seconds": total, "stages": stages, "counters": counters}
+
+
+def write_report(path, pages):
+    report = {"aggregate": aggregate(pages), "pages": pages}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    return report
+
+
+def format_top_pages(pages, limit=10):
+    slowest = sorted(pages, key=lambda page: page["seconds"], reverse=True)[:limit]
+    lines = [f"{'ms':>9}  {'slowest stage':<24}  page"]
+    for page in slowest:
+        stage = max(page["stages"].items(), key=lambda item: item[1]["seconds"], default=None)
+        stage_name = f"{stage[0]} ({stage[1]['seconds'] * 1000:.1f})" if stage else "-"
+        lines.append(f"{page['seconds'] * 1000:9.2f}  {stage_name:<24}  {page['page']}")
+    return "\n".join(lines)
@@ -0,0 +1,149 @@
+import json
+import os
+import re
+from collections import Counter
+
+from inline_markdown import plain_text
+
+
+SEARCH_INDEX_VERSION = 1
+
+TERM_PATTERN = re.compile(r"\w{2,}")
+
+# For ASCII text, mapping every non-word character to a space and splitting
+# finds the same terms as TERM_PATTERN several times faster.
+_ASCII_SEPARATORS = str.maketrans(
+    {chr(c): " " for c in range(128) if not (chr(c).isalnum() or chr(c) == "_")}
+)
+
+# How much one occurrence of a term counts for, by heading level; body text
+# counts 1.
+HEADING_WEIGHTS = {1: 8, 2: 4, 3: 2, 4: 2, 5: 2, 6: 2}
+
+# Where the index goes inside the public directory. The client loads
+# index.json, then only the shards holding the terms of a query.
+SEARCH_DIR = "search"
+
+
+class PageTerms:
+    # Term weights of one page, recorded from the plain text of its inline
+    # nodes while they are converted. Texts are buffered by weight and split
+    # into terms once per page, which is much cheaper than per text.
+    __slots__ = ("texts", "title")
+
+    def __init__(self):
+        self.texts = {}
+        self.title = None
+
+    def __repr__(self):
+        return f"PageTerms({sum(map(len, self.texts.values()))} texts, title={self.title!r})"
+
+    def record(self, nodes, heading=0):
+        if len(nodes) == 1 and nodes[0].tag is None:
+            text = nodes[0].value
+        else:
+            # Separated so an image's alt text never runs into the words
+            # around it.
+            text = plain_text(nodes, " ")
+        if heading == 1 and self.title is None:
+            self.title = text
+        self.add(text, HEADING_WEIGHTS.get(heading, 1))
+
+    def add(self, text, weight=1):
+        texts = self.texts.get(weight)
+        if texts is None:
+            texts = self.texts[weight] = []
+        texts.append(text)
+
+    @property
+    def terms(self):
+        terms = Counter()
+        for weight, texts in self.texts.items():
+            counts = _count_terms(" ".join(texts).lower())
+            if weight != 1:
+                for term in counts:
+                    counts[term] *= weight
+            terms.update(counts)
+        return dict(terms)
+
+    def as_dict(self):
+        return {"title": self.title, "terms": self.terms}
+
+
+def _count_terms(text):
+    if not text.isascii():
+        return Counter(TERM_PATTERN.findall(text))
+    counts = Counter(text.translate(_ASCII_SEPARATORS).split())
+    for term in [term for term in counts if len(term) < 2]:
+        del counts[term]
+    return counts
+
+
+def shard_key(term):
+    first = term[0]
+    return first if "a" <= first <= "z" or "0" <= first <= "9" else "_"
+
+
+class SearchIndex:
+    def __init__(self):
+        # url -> {"title": ..., "terms": {term: weight}}
+        self.pages = {}
+
+    def __repr__(self):
+        return f"SearchIndex({len(self.pages)} pages)"
+
+    def add(self, url, page_terms):
+        self.pages[url] = page_terms
+
+    def build(self):
+        # Returns (pages, shards). pages lists [url, title] by page id;
+        # shards maps a shard key to {term: [id, weight, id, weight, ...]}
+        # with ids delta-encoded and ascending, which keeps the JSON small.
+        urls = sorted(self.pages)
+        pages = []
+        postings = {}
+        for page_id, url in enumerate(urls):
+            entry = self.pages[url]
+            pages.append([url, entry["title"] or url])
+            for term, weight in entry["terms"].items():
+                postings.setdefault(term, []).append((page_id, weight))
+        shards = {}
+        for term in sorted(postings):
+            flat = []
+            last = 0
+            for page_id, weight in postings[term]:
+                flat.append(page_id - last)
+                flat.append(weight)
+                last = page_id
+            shards.setdefault(shard_key(term), {})[term] = flat
+        return pages, shards
+
+    def write(self, public_dir, writer):
+        # Writes through an OutputWriter so unchanged shards keep their
+        # mtimes, and removes shards that are no longer produced.
+        pages, shards = self.build()
+        directory = os.path.join(public_dir, SEARCH_DIR)
+        meta = {"version": SEARCH_INDEX_VERSION, "pages": pages, "shards": sorted(shards)}
+        writer.write(os.path.join(directory, "index.json"), _dumps(meta))
+        expected = {"index.json"}
+        for key, terms in shards.items():
+            name = f"terms-{key}.json"
+            expected.add(name)
+            writer.write(os.path.join(directory, name), _dumps(terms))
+        if os.path.isdir(directory):
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".json") and name not in expected:
+                    writer.remove(os.path.join(directory, name))
+
+
+def decode_postings(flat):
+    postings = []
+    page_id = 0
+    for i in range(0, len(flat), 2):
+        page_id += flat[i]
+        postings.append((page_id, flat[i + 1]))
+    return postings
+
+
+def _dumps(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
@@ -0,0 +1,333 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from block_cache import BlockCache
+from block_markdown import use_asset_urls
+from build import (
+    asset_state_path,
+    render_page,
+    write_page,
+    output_name,
+    use_template,
+    with_asset_urls,
+)
+from template import load_template
+
+
+RELOAD_PATH = "/__livereload"
+
+RELOAD_SCRIPT = """<script>
+(function poll(version) {
+  fetch("%s?since=" + version)
+    .then(function (r) { return r.text(); })
+    .then(function (v) { if (version >= 0 && v !== String(version)) { location.reload(); } else { poll(Number(v)); } })
+    .catch(function () { setTimeout(function () { poll(version); }, 1000); });
+})(-1);
+</script>
+""" % RELOAD_PATH
+
+
+def scan_sources(content_dir):
+    found = {}
+    stack = [(content_dir, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append((entry.path, prefix + entry.name + os.sep))
+                elif entry.name.endswith(".md"):
+                    stat = entry.stat()
+                    found[prefix + entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+class LiveReload:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def bump(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, since, timeout=25.0):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != since, timeout)
+            return self.version
+
+
+class Watcher:
+    def __init__(
+        self,
+        content_dir,
+        public_dir,
+        reload=None,
+        interval=0.02,
+        debounce=0.01,
+        template_path=None,
+        static_dir=None,
+        hash_assets=False,
+        link_assets=False,
+        cache_dir=None,
+        asset_urls=None,
+    ):
+        self.content_dir = content_dir
+        self.public_dir = public_dir
+        self.reload = reload
+        self.interval = interval
+        self.debounce = debounce
+        self.snapshot = scan_sources(content_dir)
+        # Edits usually touch a block or two of a page; the rest of it is
+        # stitched back from the fragments of the previous render.
+        self.block_cache = BlockCache()
+        self.template_path = template_path
+        self.template = load_template(template_path) if template_path else None
+        # asset_urls is the map the initial build published static/ under;
+        # pages rendered here must point at the same names.
+        self.static_dir = static_dir
+        self.hash_assets = hash_assets
+        self.link_assets = link_assets
+        self.cache_dir = cache_dir
+        self.asset_urls = asset_urls or None
+        self.static_snapshot = self.scan_static()
+        self.use_layout()
+
+    def use_layout(self):
+        use_template(with_asset_urls(self.template, self.asset_urls))
+        use_asset_urls(self.asset_urls)
+
+    def template_changed(self):
+        if self.template is None or not self.template.is_stale():
+            return False
+        try:
+            self.template = load_template(self.template_path)
+        except (OSError, ValueError) as e:
+            print(f"error: {e}")
+            return False
+        self.use_layout()
+        return True
+
+    def scan_static(self):
+        if self.static_dir is None or not os.path.isdir(self.static_dir):
+            return {}
+        from assets import scan_static
+
+        return scan_static(self.static_dir)
+
+    def static_changed(self):
+        # Returns (synced, urls_changed): whether static/ was mirrored again,
+        # and whether that moved any file to a new published name, in which
+        # case every page linking to it is stale.
+        current = self.scan_static()
+        if current == self.static_snapshot:
+            return False, False
+        self.static_snapshot = current
+        from assets import sync_static
+
+        try:
+            report = sync_static(
+                self.static_dir,
+                self.public_dir,
+                hashed=self.hash_assets,
+                link=self.link_assets,
+                state_path=asset_state_path(self.cache_dir),
+            )
+        except OSError as e:
+            print(f"error: {e}")
+            return False, False
+        asset_urls = report.urls() or None
+        if asset_urls == self.asset_urls:
+            return True, False
+        self.asset_urls = asset_urls
+        # Cached block fragments hold the old names.
+        self.block_cache.clear()
+        self.use_layout()
+        return True, True
+
+    def poll(self):
+        current = scan_sources(self.content_dir)
+        changed = sorted(page for page, stamp in current.items() if self.snapshot.get(page) != stamp)
+        deleted = sorted(page for page in self.snapshot if page not in current)
+        self.snapshot = current
+        return changed, deleted
+
+    def poll_pages(self, pages):
+        changed = []
+        deleted = []
+        for page in pages:
+            try:
+                stat = os.stat(os.path.join(self.content_dir, page))
+            except FileNotFoundError:
+                if self.snapshot.pop(page, None) is not None:
+                    deleted.append(page)
+                continue
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self.snapshot.get(page) != stamp:
+                self.snapshot[page] = stamp
+                changed.append(page)
+        return changed, deleted
+
+    def rebuild(self, changed, deleted):
+        # Returns the changed pages that were rendered and written; the others
+        # are reported and keep their previous output.
+        rendered = []
+        for page in changed:
+            try:
+                html = render_page(self.content_dir, page, block_cache=self.block_cache)
+                write_page(self.public_dir, page, html)
+            except (OSError, ValueError) as e:
+                print(f"error: {e}")
+                continue
+            rendered.append(page)
+        for page in deleted:
+            self.block_cache.forget(page)
+            path = os.path.join(self.public_dir, output_name(page))
+            if os.path.exists(path):
+                os.remove(path)
+        if self.reload is not None:
+            self.reload.bump()
+        return rendered
+
+    def run(self, stop):
+        while not stop.wait(self.interval):
+            changed, deleted = self.poll()
+            synced, urls_changed = self.static_changed()
+            if self.template_changed() or urls_changed:
+                # Every page embeds the layout, so all of them are stale.
+                changed = sorted(self.snapshot)
+            if not changed and not deleted:
+                if synced and self.reload is not None:
+                    self.reload.bump()
+                continue
+            # Editors often save in several steps; keep collecting until the
+            # pages just touched have been quiet for one debounce period. Only
+            # those pages are re-checked, so this does not rescan the tree.
+            started = time.perf_counter()
+            while not stop.wait(self.debounce):
+                more_changed, more_deleted = self.poll_pages(changed)
+                if not more_changed and not more_deleted:
+                    break
+                changed = sorted(set(changed + more_changed) - set(more_deleted))
+                deleted = sorted(set(deleted + more_deleted) - set(more_changed))
+            rendered = self.rebuild(changed, deleted)
+            elapsed = (time.perf_counter() - started) * 1000
+            failed = len(changed) - len(rendered)
+            print(
+                f"Rebuilt {len(rendered)} pages, removed {len(deleted)} in {elapsed:.1f} ms"
+                + (f" ({failed} failed)" if failed else "")
+            )
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, reload=None, quiet=False, **kwargs):
+        self.reload = reload
+        self.quiet = quiet
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path == RELOAD_PATH:
+            self.send_reload(query)
+            return
+        file_path = self.translate_path(path)
+        if os.path.isdir(file_path):
+            file_path = os.path.join(file_path, "index.html")
+        if self.reload is not None and file_path.endswith(".html") and os.path.isfile(file_path):
+            self.send_html(file_path)
+            return
+        super().do_GET()
+
+    def send_reload(self, query):
+        since = -1
+        if query.startswith("since="):
+            try:
+                since = int(query[len("since="):])
+            except ValueError:
+                pass
+        version = 0
+        if self.reload is not None:
+            version = self.reload.wait(since) if since >= 0 else self.reload.version
+        body = str(version).encode("ascii")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_html(self, file_path):
+        with open(file_path, "rb") as f:
+            html = f.read().decode("utf-8")
+        index = html.rfind("</body>")
+        if index == -1:
+            html += RELOAD_SCRIPT
+        else:
+            html = html[:index] + RELOAD_SCRIPT + html[index:]
+        body = html.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet and not self.path.startswith(RELOAD_PATH):
+            super().log_message(format, *args)
+
+
+def make_server(public_dir, host="127.0.0.1", port=8888, reload=None, quiet=False):
+    # quiet drops the per-request log lines written to stderr.
+    handler = functools.partial(
+        LiveReloadHandler, directory=public_dir, reload=reload, quiet=quiet
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(
+    content_dir,
+    public_dir,
+    host="127.0.0.1",
+    port=8888,
+    watch=False,
+    template_path=None,
+    static_dir=None,
+    hash_assets=False,
+    link_assets=False,
+    cache_dir=None,
+    asset_urls=None,
+):
+    reload = LiveReload() if watch else None
+    server = make_server(public_dir, host, port, reload)
+    server.daemon_threads = True
+    stop = threading.Event()
+    watcher_thread = None
+    if watch:
+        watcher = Watcher(
+            content_dir,
+            public_dir,
+            reload,
+            template_path=template_path,
+            static_dir=static_dir,
+            hash_assets=hash_assets,
+            link_assets=link_assets,
+            cache_dir=cache_dir,
+            asset_urls=asset_urls,
+        )
+        watcher_thread = threading.Thread(target=watcher.run, args=(stop,), daemon=True)
+        watcher_thread.start()
+    print(f"Serving {public_dir} at http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        if watcher_thread is not None:
+            watcher_thread.join()
@@ -0,0 +1,103 @@
+import os
+import re
+
+
+# {{ Name }} is a slot filled per page. {{> file.html }} is a partial: it is
+# read relative to the file that includes it and spliced in at compile time.
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(>?)\s*([\w./-]+)\s*\}\}")
+
+_TEMPLATES = {}
+
+
+class Template:
+    def __init__(self, parts, slots, text, stamps=()):
+        # parts holds the literal segments with None wherever a slot goes;
+        # slots lists (index into parts, name) for each of them.
+        self.parts = parts
+        self.slots = slots
+        self.text = text
+        self.stamps = stamps
+
+    def __repr__(self):
+        return f"Template({len(self.parts)} parts, slots={self.names()})"
+
+    def names(self):
+        return sorted({name for _, name in self.slots})
+
+    def map_literals(self, func):
+        parts = [None if part is None else func(part) for part in self.parts]
+        return Template(parts, self.slots, func(self.text), self.stamps)
+
+    def render(self, values):
+        parts = self.parts.copy()
+        for index, name in self.slots:
+            try:
+                parts[index] = values[name]
+            except KeyError:
+                raise ValueError(f"Template has no value for {{{{ {name} }}}}") from None
+        return "".join(parts)
+
+    def is_stale(self):
+        for path, mtime, size in self.stamps:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return True
+            if stat.st_mtime_ns != mtime or stat.st_size != size:
+                return True
+        return False
+
+
+def compile_template(text, base_dir=None, stamps=None):
+    text = _expand_partials(text, base_dir, stamps if stamps is not None else [], ())
+    parts = []
+    slots = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        parts.append(text[position:match.start()])
+        slots.append((len(parts), match.group(2)))
+        parts.append(None)
+        position = match.end()
+    parts.append(text[position:])
+    return Template(parts, slots, text, tuple(stamps or ()))
+
+
+def _expand_partials(text, base_dir, stamps, including):
+    pieces = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        if not match.group(1):
+            continue
+        if base_dir is None:
+            raise ValueError(f"Partial {match.group(2)} needs a template directory")
+        # Resolved, so a.html reached again as ../x/a.html or through a
+        # symlink is still recognized as the file being included.
+        path = os.path.realpath(os.path.join(base_dir, match.group(2)))
+        if path in including:
+            raise ValueError(f"Partial {match.group(2)} includes itself")
+        pieces.append(text[position:match.start()])
+        partial = _read(path, stamps)
+        pieces.append(_expand_partials(partial, os.path.dirname(path), stamps, including + (path,)))
+        position = match.end()
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+
+def _read(path, stamps):
+    with open(path, encoding="utf-8") as f:
+        stat = os.fstat(f.fileno())
+        text = f.read()
+    stamps.append((path, stat.st_mtime_ns, stat.st_size))
+    return text
+
+
+def load_template(path):
+    # Compiled templates are kept for the life of the process and recompiled
+    # once the file or one of its partials changes on disk.
+    path = os.path.abspath(path)
+    template = _TEMPLATES.get(path)
+    if template is None or template.is_stale():
+        stamps = []
+        text = _read(path, stamps)
+        template = _TEMPLATES[path] = compile_template(text, os.path.dirname(path), stamps)
+    return template
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+
+from assets import ASSET_MANIFEST, hashed_name, rewrite_asset_urls, sync_static
+from build import build_site
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.state = os.path.join(self.tmp.name, "cache", "assets.json")
+        os.makedirs(os.path.join(self.static, "images"))
+        self.write("style.css", "body { color: black; }")
+        self.write(os.path.join("images", "logo.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.static, name)
+        with open(path, "w") as f:
+            f.write(text)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def read(self, name):
+        with open(os.path.join(self.public, name)) as f:
+            return f.read()
+
+    def test_copy_on_change(self):
+        first = sync_static(self.static, self.public, state_path=self.state)
+        self.assertEqual(len(first.copied), 2)
+        self.assertEqual(self.read(os.path.join("images", "logo.png")), "png")
+        self.assertEqual(first.urls(), {})
+
+        second = sync_static(self.static, self.public, state_path=self.state)
+        self.assertEqual((second.copied, len(second.skipped)), ([], 2))
+
+        self.write("style.css", "body { color: white; }")
+        os.remove(os.path.join(self.static, "images", "logo.png"))
+        third = sync_static(self.static, self.public, state_path=self.state)
+        self.assertEqual(third.copied, [os.path.join(self.public, "style.css")])
+        self.assertEqual(third.removed, [os.path.join(self.public, "images/logo.png")])
+        self.assertEqual(self.read("style.css"), "body { color: white; }")
+
+    def test_touched_file_is_not_copied(self):
+        sync_static(self.static, self.public)
+        self.write("style.css", "body { color: black; }")
+        report = sync_static(self.static, self.public)
+        self.assertEqual(report.copied, [])
+
+    def test_hard_links(self):
+        sync_static(self.static, self.public, link=True)
+        source = os.stat(os.path.join(self.static, "style.css"))
+        self.assertTrue(os.path.samestat(source, os.stat(os.path.join(self.public, "style.css"))))
+
+    def test_hashed_names(self):
+        report = sync_static(self.static, self.public, hashed=True, state_path=self.state)
+        name = report.published["style.css"]
+        self.assertRegex(name, r"^style\.[0-9a-f]{12}\.css$")
+        self.assertEqual(self.read(name), "body { color: black; }")
+        self.assertEqual(json.loads(self.read(ASSET_MANIFEST)), report.published)
+        self.assertEqual(report.urls()["/style.css"], "/" + name)
+
+        self.write("style.css", "body { color: red; }")
+        report = sync_static(self.static, self.public, hashed=True, state_path=self.state)
+        self.assertNotEqual(report.published["style.css"], name)
+        self.assertEqual(report.removed, [os.path.join(self.public, name)])
+
+    def test_hashed_name_and_rewrite(self):
+        self.assertEqual(hashed_name("a/b.min.js", "0123456789abcdef"), "a/b.min.0123456789ab.js")
+        self.assertEqual(
+            rewrite_asset_urls('<link href="/style.css"> style.css', {"/style.css": "/style.1.css"}),
+            '<link href="/style.1.css"> style.css',
+        )
+
+    def test_build_references_hashed_assets(self):
+        content = os.path.join(self.tmp.name, "content")
+        os.makedirs(content)
+        with open(os.path.join(content, "index.md"), "w") as f:
+            f.write("# Home\n\n![logo](/images/logo.png) and [css](/style.css) and [other](/other.css) and **[bold *css*](/style.css)**")
+        for workers in (1, 2):
+            report = build_site(content, self.public, workers=workers, static_dir=self.static, hash_assets=True)
+            html = self.read("index.html")
+            published = report.assets.published
+            self.assertIn(f'<link href="/{published["style.css"]}"', html)
+            self.assertIn(f'src="/{published["images/logo.png"]}"', html)
+            self.assertEqual(html.count(f'href="/{published["style.css"]}"'), 3)
+            self.assertIn('href="/other.css"', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+
+from async_convert import AsyncConverter
+from convert import convert
+
+
+DOCUMENT = "\n\n".join(f"Paragraph {i} with **bold** and a [link](/page{i})" for i in range(200))
+
+
+class TestAsyncConverter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.converter = AsyncConverter(workers=2)
+
+    async def asyncTearDown(self):
+        await self.converter.aclose()
+
+    async def test_convert(self):
+        self.assertEqual(await self.converter.convert(DOCUMENT), convert(DOCUMENT))
+
+    async def test_identical_requests_share_a_render(self):
+        results = await asyncio.gather(*(self.converter.convert(DOCUMENT) for _ in range(5)))
+        self.assertEqual(results, [convert(DOCUMENT)] * 5)
+        self.assertEqual((self.converter.rendered, self.converter.coalesced), (1, 4))
+        # Done renders are served from the cache from then on.
+        await self.converter.convert(DOCUMENT)
+        self.assertEqual(self.converter.rendered, 1)
+        self.assertEqual(self.converter.renders, {})
+
+    async def test_stream(self):
+        chunks = [chunk async for chunk in self.converter.stream(DOCUMENT, blocks_per_chunk=16)]
+        self.assertEqual(len(chunks), 2 + 13)
+        self.assertEqual("".join(chunks), convert(DOCUMENT))
+        # Stopping part way leaves nothing behind once renders that had
+        # already reached the pool are done.
+        stream = self.converter.stream(DOCUMENT + "\n\nmore", blocks_per_chunk=1)
+        await anext(stream)
+        await anext(stream)
+        await stream.aclose()
+        running = [render.task for render in self.converter.renders.values()]
+        await asyncio.gather(*running, return_exceptions=True)
+        self.assertEqual(self.converter.renders, {})
+
+    async def test_empty_document(self):
+        self.assertEqual(await self.converter.convert(""), "<div></div>")
+        chunks = [chunk async for chunk in self.converter.stream("  \n")]
+        self.assertEqual("".join(chunks), "<div></div>")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AsyncConverter(max_pending=0)
+
+    async def test_timeout_while_waiting_for_a_slot(self):
+        converter = AsyncConverter(workers=1, max_pending=1, cache_bytes=0)
+        try:
+            slow = asyncio.ensure_future(converter.convert(DOCUMENT * 50))
+            await asyncio.sleep(0)
+            with self.assertRaises(TimeoutError):
+                await converter.convert("# queued", timeout=0.001)
+            await slow
+            # The timed out request never reached the pool.
+            self.assertEqual(converter.rendered, 1)
+            self.assertEqual(converter.renders, {})
+        finally:
+            await converter.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from block_cache import BlockCache
+from block_markdown import markdown_to_html_node
+from build import render_page
+from inline_markdown import markdown_to_blocks
+from link_index import PageLinks
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_matches_full_render(self):
+        markdown = "# Title\n\nSome **bold** [link](/a)\n\n* one\n* two\n\n```\ncode\n```\n\nSome **bold** [link](/a)"
+        cache = BlockCache()
+        html = cache.render("page.md", markdown_to_blocks(markdown))
+        self.assertEqual(html, markdown_to_html_node(markdown).to_html())
+        # The repeated paragraph is converted once.
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def test_only_edited_blocks_are_rendered(self):
+        blocks = [f"Paragraph {i} with *emphasis*" for i in range(100)]
+        cache = BlockCache()
+        cache.render("page.md", blocks)
+        blocks[50] = "An edited paragraph"
+        html = cache.render("page.md", blocks)
+        self.assertEqual((cache.hits, cache.misses), (99, 101))
+        self.assertEqual(html, markdown_to_html_node("\n\n".join(blocks)).to_html())
+        # Fragments of blocks that are gone are dropped.
+        self.assertEqual(len(cache.pages["page.md"]), 100)
+        cache.forget("page.md")
+        self.assertEqual(cache.pages, {})
+
+    def test_links_are_replayed(self):
+        cache = BlockCache()
+        blocks = ["[a](/a) ![b](/b.png)", "plain", "[c](/c)"]
+        for _ in range(2):
+            links = PageLinks()
+            cache.render("page.md", blocks, links)
+            self.assertEqual(links.links, ["/a", "/c"])
+            self.assertEqual(links.images, ["/b.png"])
+
+    def test_empty_page(self):
+        self.assertEqual(BlockCache().render("page.md", []), "<div></div>")
+
+    def test_render_page(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "page.md"), "w") as f:
+                f.write("# Title\n\n[link](/x)")
+            cache = BlockCache()
+            links = PageLinks()
+            html = render_page(tmp, "page.md", links, block_cache=cache)
+            self.assertEqual(html, render_page(tmp, "page.md"))
+            self.assertEqual(links.links, ["/x"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+
+from block_markdown import markdown_to_html_node, extract_title, text_to_children
+from htmlnode import LeafNode
+
+
+class TestBlockMarkdown(unittest.TestCase):
+    def test_heading_and_paragraph(self):
+        md = "# Title\n\nThis is **bold**\ntext"
+        node = markdown_to_html_node(md)
+        self.assertEqual(
+            node.to_html(),
+            "<div><h1>Title</h1><p>This is <b>bold</b> text</p></div>",
+        )
+
+    def test_heading_levels(self):
+        node = markdown_to_html_node("### Third level")
+        self.assertEqual(node.to_html(), "<div><h3>Third level</h3></div>")
+
+    def test_quote(self):
+        node = markdown_to_html_node("> a *quoted* line")
+        self.assertEqual(
+            node.to_html(),
+            "<div><blockquote>a <i>quoted</i> line</blockquote></div>",
+        )
+
+    def test_lists(self):
+        node = markdown_to_html_node("* first item\n* second item\n\n1. numbered item")
+        self.assertEqual(
+            node.to_html(),
+            "<div><ul><li>first item</li><li>second item</li></ul><ol><li>numbered item</li></ol></div>",
+        )
+
+    def test_code(self):
+        node = markdown_to_html_node("```print(\"hi\")```")
+        self.assertEqual(
+            node.to_html(),
+            "<div><pre><code>print(\"hi\")</code></pre></div>",
+        )
+
+    def test_fenced_code(self):
+        md = "```python\ndef f():\n\n    return 1\n```"
+        node = markdown_to_html_node(md)
+        self.assertEqual(
+            node.to_html(),
+            "<div><pre><code>def f():\n\n    return 1\n</code></pre></div>",
+        )
+
+    def test_empty_code(self):
+        for md in ("```\n```", "```python\n```", "``````"):
+            self.assertEqual(
+                markdown_to_html_node(md).to_html(), "<div><pre><code></code></pre></div>"
+            )
+
+    def test_image(self):
+        node = markdown_to_html_node("![alt text](/images/a.png)")
+        self.assertEqual(
+            node.to_html(),
+            '<div><p><img src="/images/a.png" alt="alt text"></p></div>',
+        )
+
+    def test_empty_document(self):
+        for md in ("", "  \n\n  "):
+            self.assertEqual(markdown_to_html_node(md).to_html(), "<div></div>")
+        self.assertEqual(
+            markdown_to_html_node("> ").to_html(), "<div><blockquote></blockquote></div>"
+        )
+
+    def test_full_document(self):
+        md = """# Guide
+
+Intro with a [link](/docs) and
+a second line.
+
+## Steps
+
+1. Install
+2. Run **it**
+
+> Quoted
+> text
+
+```
+*not italic* [not a link](x)
+```
+"""
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><h1>Guide</h1>"
+            '<p>Intro with a <a href="/docs">link</a> and a second line.</p>'
+            "<h2>Steps</h2>"
+            "<ol><li>Install</li><li>Run <b>it</b></li></ol>"
+            "<blockquote>Quoted text</blockquote>"
+            "<pre><code>*not italic* [not a link](x)\n</code></pre></div>",
+        )
+
+    def test_plain_text_fast_path(self):
+        children = text_to_children("No markup here, just text.")
+        self.assertEqual(len(children), 1)
+        self.assertIsInstance(children[0], LeafNode)
+        self.assertIsNone(children[0].tag)
+        self.assertEqual(children[0].value, "No markup here, just text.")
+        self.assertEqual(text_to_children(""), [])
+
+    def test_unclosed_markup_does_not_abort(self):
+        html = markdown_to_html_node("Some **unclosed text\n\n* item *x\n* `tick").to_html()
+        self.assertEqual(
+            html,
+            "<div><p>Some **unclosed text</p><ul><li>item *x</li><li>`tick</li></ul></div>",
+        )
+
+    def test_extract_title(self):
+        self.assertEqual(extract_title("intro\n# Hello  \nbody"), "Hello")
+        self.assertIsNone(extract_title("## Not a title"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from build import build_site, find_pages, output_name, render_pages
+
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        for i in range(12):
+            path = os.path.join(self.content, f"section{i % 3}", f"page{i}.md")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(f"# Page {i}\n\nSome **bold** text on page {i}\n\n* item {i}\n* another item")
+        with open(os.path.join(self.content, "index.md"), "w") as f:
+            f.write("# Home\nWelcome")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_tree(self, root):
+        tree = {}
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(dirpath, name)
+                with open(path) as f:
+                    tree[os.path.relpath(path, root)] = f.read()
+        return tree
+
+    def test_find_pages(self):
+        pages = find_pages(self.content)
+        self.assertEqual(pages[0], "index.md")
+        self.assertEqual(len(pages), 13)
+        self.assertEqual(pages, sorted(pages, key=lambda p: (os.path.dirname(p), p)))
+
+    def test_output_name(self):
+        self.assertEqual(output_name(os.path.join("blog", "post.md")), os.path.join("blog", "post.html"))
+
+    def test_parallel_matches_serial(self):
+        serial = os.path.join(self.tmp.name, "serial")
+        parallel = os.path.join(self.tmp.name, "parallel")
+        build_site(self.content, serial, workers=1)
+        build_site(self.content, parallel, workers=3)
+        serial_tree = self.read_tree(serial)
+        self.assertEqual(len(serial_tree), 13)
+        self.assertEqual(serial_tree, self.read_tree(parallel))
+        self.assertIn("<title>Home</title>", serial_tree["index.html"])
+        self.assertIn(
+            "<h1>Page 4</h1>",
+            serial_tree[os.path.join("section1", "page4.html")],
+        )
+
+    def test_render_pages_is_lazy(self):
+        # Each page comes back before the next is read, so it can be written
+        # while the rest of the site renders.
+        for workers in (1, 2):
+            rendered = render_pages(self.content, ["index.md", "missing.md"], workers=workers)
+            html, links, terms = next(rendered)
+            self.assertIn("<h1>Home</h1>", html)
+            with self.assertRaises(FileNotFoundError):
+                next(rendered)
+
+    def test_empty_page(self):
+        with open(os.path.join(self.content, "empty.md"), "w") as f:
+            f.write("  \n\n")
+        public = os.path.join(self.tmp.name, "public")
+        build_site(self.content, public, workers=1)
+        html = self.read_tree(public)["empty.html"]
+        self.assertIn("<title>empty</title>", html)
+        self.assertIn("<article><div></div></article>", html)
+
+
+class TestImports(unittest.TestCase):
+    def test_optional_subsystems_load_lazily(self):
+        # A fresh interpreter, since this one has imported everything already.
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, main; print(' '.join(sys.modules))"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        loaded = set(result.stdout.split())
+        self.assertIn("build", loaded)
+        for name in ("concurrent.futures.process", "inline_cache", "profiling", "search_index", "serve"):
+            self.assertNotIn(name, loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+
+from build import build_site
+from build_cache import BuildManifest, converter_hash, file_hash
+
+
+class TestBuildCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.cache = os.path.join(self.tmp.name, "cache")
+        os.makedirs(os.path.join(self.content, "blog"))
+        self.write("index.md", "# Home\nWelcome")
+        self.write(os.path.join("blog", "post.md"), "# Post\nSome *text*")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, page, markdown):
+        with open(os.path.join(self.content, page), "w") as f:
+            f.write(markdown)
+
+    def build(self, force=False):
+        return build_site(self.content, self.public, workers=1, cache_dir=self.cache, force=force)
+
+    def test_unchanged_pages_are_skipped(self):
+        first = self.build()
+        self.assertEqual(len(first.written), 2)
+        second = self.build()
+        self.assertEqual(second.written, [])
+        self.assertEqual(len(second.skipped), 2)
+
+    def test_changed_page_is_rebuilt(self):
+        self.build()
+        self.write("index.md", "# Home\nWelcome back")
+        report = self.build()
+        self.assertEqual(report.written, [os.path.join(self.public, "index.html")])
+        with open(report.written[0]) as f:
+            self.assertIn("Welcome back", f.read())
+
+    def test_touched_page_is_skipped(self):
+        self.build()
+        path = os.path.join(self.content, "index.md")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(self.build().written, [])
+
+    def test_missing_output_is_rebuilt(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        report = self.build()
+        self.assertEqual(report.written, [os.path.join(self.public, "index.html")])
+
+    def test_deleted_source_removes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        report = self.build()
+        output = os.path.join(self.public, "blog", "post.html")
+        self.assertEqual(report.removed, [output])
+        self.assertFalse(os.path.exists(output))
+
+    def test_force(self):
+        self.build()
+        report = self.build(force=True)
+        # Every page is rendered again, but identical output is not rewritten.
+        self.assertEqual(report.written, [])
+        self.assertEqual(len(report.unchanged), 2)
+        self.assertEqual(self.build().written, [])
+
+    def test_converter_change_invalidates(self):
+        self.build()
+        path = os.path.join(self.cache, "manifest.json")
+        with open(path) as f:
+            data = json.load(f)
+        data["converter"] = "old"
+        with open(path, "w") as f:
+            json.dump(data, f)
+        self.assertEqual(len(self.build().unchanged), 2)
+        self.assertEqual(self.build().written, [])
+
+    def test_manifest_round_trip(self):
+        path = os.path.join(self.cache, "manifest.json")
+        manifest = BuildManifest(path, converter="v1")
+        source = os.path.join(self.content, "index.md")
+        manifest.record("index.md", {"source": file_hash(source), "mtime": 0, "size": 0}, "index.html", "cfg")
+        manifest.save()
+        self.assertEqual(BuildManifest(path, converter="v1").pages(), ["index.md"])
+        self.assertTrue(BuildManifest(path, converter="v2").stale)
+        self.assertEqual(len(converter_hash()), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+
+import convert as convert_module
+from block_markdown import markdown_to_html_node, use_inline_cache
+from convert import DocumentCache, convert, convert_many
+
+
+DOCUMENTS = [
+    f"# Note {i}\n\nSee [the docs](/docs) and **item {i % 3}**\n\n* one\n* two `code`"
+    for i in range(50)
+]
+
+
+def failing_markdown_to_html_node(markdown):
+    if markdown == "fail":
+        raise ValueError("injected failure")
+    return markdown_to_html_node(markdown)
+
+
+def inject_failure():
+    # Run in each worker process, which does not share the test's patches.
+    convert_module.markdown_to_html_node = failing_markdown_to_html_node
+
+
+class TestConvert(unittest.TestCase):
+    def test_convert(self):
+        for markdown in DOCUMENTS[:3]:
+            self.assertEqual(convert(markdown), markdown_to_html_node(markdown).to_html())
+
+    def test_convert_many_serial(self):
+        expected = [convert(markdown) for markdown in DOCUMENTS]
+        self.assertEqual(list(convert_many(DOCUMENTS)), expected)
+        self.assertEqual(list(convert_many(iter(DOCUMENTS), cache_bytes=0)), expected)
+        self.assertEqual(list(convert_many(DOCUMENTS, inline_cache_bytes=1 << 20)), expected)
+
+    def test_document_cache(self):
+        cache = DocumentCache()
+        list(convert_many(DOCUMENTS[:2] * 2, cache=cache))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        list(convert_many(DOCUMENTS[:2], cache=cache))
+        self.assertEqual(cache.hits, 4)
+
+        small = DocumentCache(max_bytes=2000)
+        for markdown in DOCUMENTS:
+            small.convert(markdown)
+        self.assertLessEqual(small.bytes, 2000)
+        self.assertGreater(small.evictions, 0)
+        self.assertEqual(small.convert(DOCUMENTS[-1]), convert(DOCUMENTS[-1]))
+        self.assertEqual(small.hits, 1)
+
+    def test_cache_is_not_left_installed(self):
+        results = convert_many(DOCUMENTS)
+        next(results)
+        previous = use_inline_cache(None)
+        self.assertIsNone(previous)
+        results.close()
+
+    def test_convert_many_processes(self):
+        expected = [convert(markdown) for markdown in DOCUMENTS]
+        self.assertEqual(list(convert_many(DOCUMENTS, workers=2, chunksize=7)), expected)
+        self.assertEqual(
+            list(convert_many(DOCUMENTS, workers=2, cache_bytes=0, inline_cache_bytes=1 << 20)),
+            expected,
+        )
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            self.assertEqual(list(convert_many(DOCUMENTS, executor=pool, chunksize=4)), expected)
+            # The pool stays usable once a batch is abandoned part way.
+            results = convert_many(DOCUMENTS, executor=pool, chunksize=1)
+            self.assertEqual(next(results), expected[0])
+            results.close()
+            self.assertEqual(list(convert_many(DOCUMENTS[:2], executor=pool)), expected[:2])
+
+    def test_errors_name_the_document(self):
+        documents = ["# ok", "", "fail", "# ok"]
+        message = "document 2: injected failure"
+        with mock.patch.object(convert_module, "markdown_to_html_node", failing_markdown_to_html_node):
+            with self.assertRaisesRegex(ValueError, message):
+                list(convert_many(documents))
+        with ProcessPoolExecutor(2, initializer=inject_failure) as pool:
+            with self.assertRaisesRegex(ValueError, message):
+                list(convert_many(documents, executor=pool, chunksize=1))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            convert_many(DOCUMENTS, chunksize=0)
+        with ThreadPoolExecutor() as pool:
+            with self.assertRaises(ValueError):
+                convert_many(DOCUMENTS, executor=pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from html_render import escape_text, escape_attribute, open_tag, close_tag
+
+
+class TestHTMLRender(unittest.TestCase):
+    def test_escape_text(self):
+        plain = "nothing to escape here"
+        self.assertIs(escape_text(plain), plain)
+        self.assertEqual(escape_text('a < b & "c" > d'), 'a &lt; b &amp; "c" &gt; d')
+
+    def test_escape_attribute(self):
+        self.assertEqual(escape_attribute('say "hi" & <bye>'), "say &quot;hi&quot; &amp; &lt;bye&gt;")
+        self.assertEqual(escape_attribute(3), "3")
+
+    def test_tags_are_cached(self):
+        self.assertEqual(open_tag("p"), "<p>")
+        self.assertIs(open_tag("p"), open_tag("p"))
+        self.assertIs(close_tag("p"), close_tag("p"))
+        props = {"href": "/a", "title": "A & B"}
+        self.assertEqual(open_tag("a", props), '<a href="/a" title="A &amp; B">')
+        self.assertIs(open_tag("a", props), open_tag("a", dict(props)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+import io
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import FLUSH_EVERY, FLUSH_PARTS, HTMLNode, LeafNode, ParentNode, LazyParentNode
 
 class TestHTMLNode(unittest.TestCase):
     def test_props_to_html(self):
@@ -86,5 +87,101 @@ class TestHTMLNode(unittest.TestCase):
         pexp5 = "<p><b>Bold text</b> and <i>italic text</i> in the same paragraph.</p>"
         self.assertEqual(p_node5.to_html(), pexp5)
 
+    def test_write_html(self):
+        node = ParentNode("div", [
+            ParentNode("p", [
+                LeafNode("b", "Bold text"),
+                LeafNode(None, " and normal text."),
+            ]),
+            LeafNode("a", "link", {"href": "https://www.google.com"}),
+        ], {"class": "page"})
+        expected = '<div class="page"><p><b>Bold text</b> and normal text.</p><a href="https://www.google.com">link</a></div>'
+        sink = io.StringIO()
+        node.write_html(sink)
+        self.assertEqual(sink.getvalue(), expected)
+        self.assertEqual("".join(node.iter_html()), expected)
+        self.assertEqual(node.to_html(), expected)
+
+    def test_deep_tree(self):
+        node = LeafNode(None, "deep")
+        for _ in range(10000):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * 10000 + "deep</span>"))
+        self.assertEqual(len(html), 10000 * len("<span></span>") + len("deep"))
+
+    def test_nested_parent_errors(self):
+        with self.assertRaises(ValueError):
+            ParentNode("div", [ParentNode("p", [])]).to_html()
+        with self.assertRaises(ValueError):
+            ParentNode("div", [ParentNode(None, [LeafNode(None, "text")])]).to_html()
+
+    def test_compact_nodes(self):
+        node = LeafNode("".join(["s", "pan"]), "text", {})
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertIsNone(node.props)
+        self.assertIs(node.tag, "span")
+        self.assertEqual(node.to_html(), "<span>text</span>")
+
+    def test_escaping(self):
+        node = ParentNode("p", [
+            LeafNode(None, "1 < 2 & 3 > 2"),
+            LeafNode("code", "<script>"),
+            LeafNode("a", "x", {"href": '/search?q="a"&b=1'}),
+        ])
+        self.assertEqual(
+            node.to_html(),
+            '<p>1 &lt; 2 &amp; 3 &gt; 2<code>&lt;script&gt;</code>'
+            '<a href="/search?q=&quot;a&quot;&amp;b=1">x</a></p>',
+        )
+
+    def test_long_leaf_run(self):
+        leaves = [LeafNode(None, f"word {i} ") for i in range(2000)]
+        for node in (ParentNode("p", leaves), LazyParentNode("p", iter(leaves))):
+            chunks = list(node.iter_html())
+            self.assertGreater(len(chunks), 1)
+            self.assertLess(len(chunks), 10)
+            longest_piece = len("word 1999 ")
+            for chunk in chunks:
+                self.assertTrue(chunk)
+                self.assertLessEqual(len(chunk), (FLUSH_PARTS + FLUSH_EVERY) * longest_piece)
+            self.assertEqual("".join(chunks), "<p>" + "".join(f"word {i} " for i in range(2000)) + "</p>")
+
+    def test_lazy_parent_generator(self):
+        produced = []
+
+        def paragraphs():
+            for i in range(3):
+                produced.append(i)
+                yield ParentNode("p", [LeafNode(None, f"para {i}")])
+
+        node = LazyParentNode("div", paragraphs())
+        self.assertEqual(produced, [])
+        self.assertEqual(node.to_html(), "<div><p>para 0</p><p>para 1</p><p>para 2</p></div>")
+        self.assertEqual(produced, [0, 1, 2])
+
+    def test_lazy_parent_callable(self):
+        node = LazyParentNode("ul", lambda: (LeafNode("li", str(i)) for i in range(2)), {"class": "x"})
+        expected = '<ul class="x"><li>0</li><li>1</li></ul>'
+        self.assertEqual(node.to_html(), expected)
+        self.assertEqual(node.to_html(), expected)
+        outer = ParentNode("div", [node, LazyParentNode("p", [LeafNode(None, "end")])])
+        self.assertEqual(outer.to_html(), "<div>" + expected + "<p>end</p></div>")
+
+    def test_lazy_parent_streams(self):
+        def blocks():
+            for i in range(5000):
+                yield ParentNode("p", [LeafNode(None, "text")])
+        chunks = LazyParentNode("div", blocks()).iter_html()
+        first = next(chunks)
+        self.assertTrue(first.startswith("<div><p>text</p>"))
+        self.assertLess(len(first), 5000 * len("<p>text</p>"))
+
+    def test_lazy_parent_empty(self):
+        self.assertEqual(LazyParentNode("div", iter([])).to_html(), "<div></div>")
+        self.assertEqual(LazyParentNode("div", lambda: []).to_html(), "<div></div>")
+        with self.assertRaises(ValueError):
+            LazyParentNode(None, [LeafNode(None, "x")]).to_html()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+import unittest
+
+from block_markdown import markdown_to_html_node, use_inline_cache
+from inline_cache import InlineCache
+from inline_markdown import text_to_textnodes
+from textnode import TextNode, TextType
+
+
+class TestInlineCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = InlineCache()
+        first = cache.text_to_textnodes("Some **bold** text")
+        second = cache.text_to_textnodes("Some **bold** text")
+        self.assertIs(first, second)
+        self.assertIsInstance(first, tuple)
+        self.assertEqual(list(first), text_to_textnodes("Some **bold** text"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_children(self):
+        cache = InlineCache()
+        children = cache.text_to_children("a [link](/x)")
+        self.assertEqual(children[1].to_html(), '<a href="/x">link</a>')
+        self.assertIs(cache.text_to_children("a [link](/x)"), children)
+        self.assertEqual(cache.stats()["entries"], 1)
+
+    def test_eviction(self):
+        probe = InlineCache()
+        probe.text_to_textnodes("*text 0*")
+        budget = probe.bytes * 3
+        cache = InlineCache(max_bytes=budget)
+        for i in range(10):
+            cache.text_to_textnodes(f"*text {i}*")
+        self.assertLessEqual(cache.bytes, budget)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.evictions, 7)
+        cache.text_to_textnodes("*text 9*")
+        self.assertEqual(cache.hits, 1)
+        cache.text_to_textnodes("*text 0*")
+        self.assertEqual(cache.misses, 11)
+
+    def test_recently_used_survives(self):
+        probe = InlineCache()
+        probe.text_to_textnodes("*a*")
+        cache = InlineCache(max_bytes=probe.bytes * 2)
+        cache.text_to_textnodes("*a*")
+        cache.text_to_textnodes("*b*")
+        cache.text_to_textnodes("*a*")
+        cache.text_to_textnodes("*c*")
+        self.assertEqual(cache.text_to_textnodes("*a*"), (TextNode("a", TextType.ITALIC),))
+        self.assertEqual(cache.hits, 2)
+
+    def test_oversized_entry_not_stored(self):
+        cache = InlineCache(max_bytes=10)
+        nodes = cache.text_to_textnodes("**big**")
+        self.assertEqual(nodes, (TextNode("big", TextType.BOLD),))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+    def test_block_renderer_uses_cache(self):
+        md = "* **shared** item\n* **shared** item\n\nplain paragraph"
+        expected = markdown_to_html_node(md).to_html()
+        cache = InlineCache()
+        previous = use_inline_cache(cache)
+        try:
+            self.assertEqual(markdown_to_html_node(md).to_html(), expected)
+        finally:
+            use_inline_cache(previous)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
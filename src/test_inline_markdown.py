@@ -1,13 +1,17 @@
+import time
 import unittest
 from inline_markdown import (
     text_to_textnodes,
+    parse_inline,
     split_nodes_delimiter,
     extract_markdown_images,
     extract_markdown_links,
     split_nodes_image,
     split_nodes_link,
     markdown_to_blocks,
+    iter_blocks,
     block_to_block_type,
+    BlockType,
 )
 
 from textnode import TextNode, TextType
@@ -305,16 +309,116 @@ class TestInlineMarkdown(unittest.TestCase):
             nodes,
         )
 
+    def test_text_to_textnodes_code_with_asterisk(self):
+        nodes = text_to_textnodes("Use `a * b` to multiply")
+        self.assertListEqual(
+            [
+                TextNode("Use ", TextType.TEXT),
+                TextNode("a * b", TextType.CODE),
+                TextNode(" to multiply", TextType.TEXT),
+            ],
+            nodes,
+        )
+
+    def test_text_to_textnodes_many_links(self):
+        text = "".join(f"see [link {i}](https://boot.dev/{i}) " for i in range(1000))
+        nodes = text_to_textnodes(text)
+        self.assertEqual(len(nodes), 2001)
+        self.assertEqual(nodes[1], TextNode("link 0", TextType.LINK, "https://boot.dev/0"))
+        self.assertEqual(nodes[-2], TextNode("link 999", TextType.LINK, "https://boot.dev/999"))
+
+    def test_text_to_textnodes_unclosed(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("This is **not closed")
+
+    ################
+    # parse_inline #
+    ################
+    def inline_html(self, text):
+        return ParentNode("p", parse_inline(text)).to_html()
+
+    def test_parse_inline_flat(self):
+        self.assertEqual(
+            self.inline_html(
+                "This is **text** with an *italic* word, a `code block`, an "
+                "![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
+            ),
+            '<p>This is <b>text</b> with an <i>italic</i> word, a <code>code block</code>, an '
+            '<img src="https://i.imgur.com/fJRm4Vk.jpeg" alt="obi wan image"> and a '
+            '<a href="https://boot.dev">link</a></p>',
+        )
+
+    def test_parse_inline_nested(self):
+        self.assertEqual(self.inline_html("*a **b** c*"), "<p><i>a <b>b</b> c</i></p>")
+        self.assertEqual(self.inline_html("***both***"), "<p><i><b>both</b></i></p>")
+        self.assertEqual(
+            self.inline_html("[**bold** link](/x) and **[link](/y) in bold**"),
+            '<p><a href="/x"><b>bold</b> link</a> and <b><a href="/y">link</a> in bold</b></p>',
+        )
+        self.assertEqual(
+            self.inline_html("[![logo *x*](/logo.png)](/)"),
+            '<p><a href="/"><img src="/logo.png" alt="logo x"></a></p>',
+        )
+        self.assertEqual(
+            self.inline_html("[outer [inner](/i)](/o)"),
+            '<p>[outer <a href="/i">inner</a>](/o)</p>',
+        )
+
+    def test_parse_inline_code_wins(self):
+        self.assertEqual(
+            self.inline_html("*not `a * b` closed* and ``x ` y``"),
+            "<p><i>not <code>a * b</code> closed</i> and <code>x ` y</code></p>",
+        )
+
+    def test_parse_inline_unclosed_is_literal(self):
+        self.assertEqual(self.inline_html("This is **not closed"), "<p>This is **not closed</p>")
+        self.assertEqual(self.inline_html("a * b and `tick"), "<p>a * b and `tick</p>")
+        self.assertEqual(self.inline_html("**foo*"), "<p>*<i>foo</i></p>")
+        self.assertEqual(self.inline_html("[text](/x and ![alt]"), "<p>[text](/x and ![alt]</p>")
+
+    def test_parse_inline_empty_link(self):
+        self.assertEqual(self.inline_html("a []() b"), "<p>a []() b</p>")
+        self.assertEqual(self.inline_html("[](/x)"), '<p><a href="/x">/x</a></p>')
+        self.assertEqual(self.inline_html("![]()"), '<p><img src="" alt=""></p>')
+
+    def test_parse_inline_pathological(self):
+        # Unmatched openers that make naive parsers rescan the rest of the
+        # line for every one of them; all of it stays literal text.
+        backticks = " ".join("`" * i for i in range(1, 300))
+        for text in ("*a " * 5000, "[" * 10000, backticks, "**a *b " * 3000):
+            self.assertEqual(self.inline_html(text.strip()), f"<p>{text.strip()}</p>")
+
+    def test_parse_inline_many_nested_openers(self):
+        # Each link closes over an opener left unmatched before it. This took
+        # seconds when every link rescanned all earlier openers.
+        self.assertEqual(
+            self.inline_html("[x [y](u) [x [*y*](u)"),
+            '<p>[x <a href="u">y</a> [x <a href="u"><i>y</i></a></p>',
+        )
+        start = time.perf_counter()
+        nodes = parse_inline("[x [y](u) [x [*y*](u) " * 16000)
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(sum(node.tag == "a" for node in nodes), 32000)
+
     ######################
     # markdown_to_blocks #
     ######################
     def test_markdown_to_blocks(self):
         markdown = """# This is a heading
+
         This is a paragraph of text. It has some **bold** and *italic* words inside of it.
+
         * This is the first list item in a list block
         * This is a list item
         * This is another list item"""
-        self.assertListEqual(markdown_to_blocks(markdown), ["# This is a heading","This is a paragraph of text. It has some **bold** and *italic* words inside of it.","* This is the first list item in a list block","* This is a list item","* This is another list item"])
+        self.assertListEqual(markdown_to_blocks(markdown), ["# This is a heading","This is a paragraph of text. It has some **bold** and *italic* words inside of it.","* This is the first list item in a list block\n* This is a list item\n* This is another list item"])
+
+    def test_markdown_heading_without_blank_line(self):
+        md = "# Title\nFirst line\nsecond line\n\n\n\nNext paragraph"
+        self.assertListEqual(
+            markdown_to_blocks(md),
+            ["# Title", "First line\nsecond line", "Next paragraph"],
+        )
 
     def test_markdown_one_line(self):
         md = " # This is a sentence"
@@ -324,40 +428,71 @@ class TestInlineMarkdown(unittest.TestCase):
     def test_markdown_blank(self):
         md1 = " "
         md2 = ""
-        self.assertListEqual(markdown_to_blocks(md1),[''])
-        self.assertListEqual(markdown_to_blocks(md2),[''])
+        self.assertListEqual(markdown_to_blocks(md1),[])
+        self.assertListEqual(markdown_to_blocks(md2),[])
+
+    def test_markdown_fenced_code(self):
+        md = "Before\n```\ndef f():\n\n    return 1\n```\nAfter"
+        self.assertListEqual(
+            markdown_to_blocks(md),
+            ["Before", "```\ndef f():\n\n    return 1\n```", "After"],
+        )
+
+    def test_iter_blocks_lazy(self):
+        lines = iter(["first\n", "paragraph\n", "\n", "second\n"])
+        blocks = iter_blocks(lines)
+        self.assertEqual(next(blocks), "first\nparagraph")
+        self.assertEqual(next(lines), "second\n")
+        self.assertListEqual(list(blocks), [])
 
     #######################
     # block_to_block_type #
     #######################
     def test_block_heading(self):
         heading = "# This is a heading"
-        expected = "heading"
+        expected = BlockType.HEADING
         self.assertEqual(block_to_block_type(heading),expected)
 
     def test_block_code(self):
         code = "```print(\"hello world\")```"
-        expected = "code"
+        expected = BlockType.CODE
         self.assertEqual(block_to_block_type(code), expected)
 
     def test_block_quote(self):
         quote = "> We are not given a short life, but we make it short, and we are not ill-supplied but wasteful of it."
-        expected = "quote"
+        expected = BlockType.QUOTE
         self.assertEqual(block_to_block_type(quote),expected)
 
-    def text_block_unordered_list(self):
+    def test_block_unordered_list(self):
         unordered_list = "* This is another list item"
-        expected = "unordered_list"
+        expected = BlockType.UNORDERED_LIST
         self.assertEqual(block_to_block_type(unordered_list),expected)
 
-    def text_block_ordered_list(self):
+    def test_block_ordered_list(self):
         ordered_list = "1. This is another list item"
-        expected = "ordered_list"
+        expected = BlockType.ORDERED_LIST
         self.assertEqual(block_to_block_type(ordered_list),expected)
 
+    def test_block_multiline(self):
+        self.assertEqual(block_to_block_type("> first\n> second"), BlockType.QUOTE)
+        self.assertEqual(block_to_block_type("> first\nsecond"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("* one\n- two"), BlockType.UNORDERED_LIST)
+        self.assertEqual(block_to_block_type("* one\ntwo"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1. one\n2. two\n3. three"), BlockType.ORDERED_LIST)
+        self.assertEqual(block_to_block_type("1. one\n3. three"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("```\ncode\n```"), BlockType.CODE)
+        self.assertEqual(block_to_block_type("```\nunclosed"), BlockType.PARAGRAPH)
+
+    def test_block_not_markup(self):
+        self.assertEqual(block_to_block_type("#hashtag"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("####### seven"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("*italic* start"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("2. starts at two"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1984 was a year"), BlockType.PARAGRAPH)
+
     def test_block_paragraph(self):
         para = "This is a paragraph of text. It has some **bold** and *italic* words inside of it."
-        expected = "paragraph"
+        expected = BlockType.PARAGRAPH
         self.assertEqual(block_to_block_type(para), expected)
     
 
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+from build import build_site
+from inline_markdown import parse_inline
+from link_index import LinkIndex, PageLinks, resolve_url
+
+
+class TestLinkIndex(unittest.TestCase):
+    def test_resolve_url(self):
+        self.assertEqual(resolve_url("blog/post.html", "other.html"), "blog/other.html")
+        self.assertEqual(resolve_url("blog/post.html", "../index.html#top"), "index.html")
+        self.assertEqual(resolve_url("blog/post.html", "/"), "index.html")
+        self.assertEqual(resolve_url("blog/post.html", "/docs/"), "docs/index.html")
+        self.assertEqual(resolve_url("index.html", "/images/a%20b.png?v=1"), "images/a b.png")
+        for url in ("https://boot.dev", "//cdn.example.com/x.js", "mailto:a@b.c", "#section", ""):
+            self.assertIsNone(resolve_url("index.html", url))
+
+    def test_record_nested(self):
+        links = PageLinks()
+        links.record(parse_inline("[**a**](/a) and **[b](b.html) ![c](/c.png)** [![d](/d.png)](/e)"))
+        self.assertEqual(sorted(links.links), ["/a", "/e", "b.html"])
+        self.assertEqual(sorted(links.images), ["/c.png", "/d.png"])
+
+    def test_broken_and_backlinks(self):
+        index = LinkIndex()
+        index.add("index.html", {"links": ["/blog/post", "/missing.html", "https://x.org"], "images": ["/logo.png"]})
+        index.add("blog/post.html", {"links": ["../", "/docs/"], "images": ["gone.png"]})
+        known = {"index.html", "blog/post.html", "docs/index.html", "logo.png"}
+        self.assertEqual(
+            index.broken(known),
+            [("blog/post.html", "gone.png", "images"), ("index.html", "/missing.html", "links")],
+        )
+        self.assertEqual(
+            index.backlinks(known),
+            {
+                "blog/post.html": ["index.html"],
+                "docs/index.html": ["blog/post.html"],
+                "index.html": ["blog/post.html"],
+                "missing.html": ["index.html"],
+            },
+        )
+
+
+class TestBuildLinks(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.cache = os.path.join(self.tmp.name, "cache")
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(self.static)
+        with open(os.path.join(self.static, "logo.png"), "w") as f:
+            f.write("png")
+        self.write("index.md", "# Home\n\n[post](/blog/post.html) ![logo](/logo.png) [gone](/gone.html)")
+        self.write(os.path.join("blog", "post.md"), "# Post\n\n[home](../index.html) ![x](x.png)")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, page, markdown):
+        with open(os.path.join(self.content, page), "w") as f:
+            f.write(markdown)
+
+    def build(self, workers=1):
+        return build_site(
+            self.content,
+            self.public,
+            workers=workers,
+            cache_dir=self.cache,
+            static_dir=self.static,
+            inline_cache_bytes=1 << 20,
+        )
+
+    def test_broken_links(self):
+        for workers in (1, 2):
+            report = self.build(workers)
+            self.assertEqual(
+                report.broken_links,
+                [("blog/post.html", "x.png", "images"), ("index.html", "/gone.html", "links")],
+            )
+            self.assertEqual(
+                report.links.backlinks(),
+                {"blog/post.html": ["index.html"], "gone.html": ["index.html"], "index.html": ["blog/post.html"]},
+            )
+
+    def test_index_survives_incremental_builds(self):
+        self.build()
+        self.write(os.path.join("blog", "post.md"), "# Post\n\n[home](../index.html)")
+        report = self.build()
+        self.assertEqual(len(report.skipped), 1)
+        self.assertEqual(report.broken_links, [("index.html", "/gone.html", "links")])
+        with open(os.path.join(self.public, "gone.html"), "w") as f:
+            f.write("placed by hand")
+        self.assertEqual(self.build().broken_links, [])
+
+    def test_links_outside_the_output_are_broken(self):
+        # The target exists, but outside the output directory.
+        with open(os.path.join(self.tmp.name, "secret.txt"), "w") as f:
+            f.write("not published")
+        self.write("index.md", "# Home\n\n[escape](../secret.txt) [rooted](/../secret.txt)")
+        self.write(os.path.join("blog", "post.md"), "# Post\n\n[home](../index.html)")
+        self.assertEqual(
+            self.build().broken_links,
+            [("index.html", "/../secret.txt", "links"), ("index.html", "../secret.txt", "links")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from main import main
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        # Run from a directory without template.html, as from outside the repo.
+        os.chdir(self.tmp.name)
+        os.mkdir("content")
+        with open(os.path.join("content", "index.md"), "w") as f:
+            f.write("# Home\n\nWelcome")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_main(self, *argv):
+        out = io.StringIO()
+        err = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            code = main(["build", "--workers", "1", *argv])
+        return code, out.getvalue(), err.getvalue()
+
+    def test_default_template_falls_back(self):
+        code, out, _ = self.run_main()
+        self.assertFalse(code)
+        with open(os.path.join("public", "index.html")) as f:
+            self.assertIn("<title>Home</title>", f.read())
+
+    def test_default_template_used_when_present(self):
+        with open("template.html", "w") as f:
+            f.write("<main>{{ Content }}</main>")
+        self.run_main()
+        with open(os.path.join("public", "index.html")) as f:
+            self.assertEqual(f.read(), "<main><div><h1>Home</h1><p>Welcome</p></div></main>")
+
+    def test_missing_template(self):
+        code, _, err = self.run_main("--template", "missing.html")
+        self.assertEqual(code, 1)
+        self.assertIn("Template not found: missing.html", err)
+        self.assertFalse(os.path.exists("public"))
+
+
+if __name__ == "__main__":
+    unittest.main()
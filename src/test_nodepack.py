@@ -0,0 +1,95 @@
+import pickle
+from array import array
+import unittest
+
+from block_markdown import markdown_to_html_node
+from htmlnode import LeafNode, ParentNode, LazyParentNode
+from inline_markdown import text_to_textnodes
+from nodepack import KIND_ATTR, KIND_LEAF, KIND_PARENT, NO_PARENT, NO_TAG, PackedNodes, pack_html, pack_textnodes, unpack_html, unpack_textnodes
+from textnode import TextNode, TextType
+
+
+class TestNodePack(unittest.TestCase):
+    def test_textnodes_round_trip(self):
+        nodes = text_to_textnodes(
+            "This is **text** with an *italic* word, a `code block`, an ![image](https://i.imgur.com/zjjcJKZ.png) and a [link](https://boot.dev) ünïcode"
+        )
+        packed = pack_textnodes(nodes)
+        self.assertEqual(len(packed), len(nodes) + 2)
+        self.assertListEqual(unpack_textnodes(packed), nodes)
+        self.assertListEqual(unpack_textnodes(PackedNodes.from_bytes(packed.to_bytes())), nodes)
+
+    def test_html_round_trip(self):
+        md = "# Title\n\nSome **bold** and [a link](/x \"y\").\n\n* one\n* two\n\n```\ncode\n```\n\n![alt](/a.png)"
+        tree = markdown_to_html_node(md)
+        copy = unpack_html(pack_html(tree))
+        self.assertEqual(copy.to_html(), tree.to_html())
+        self.assertIsInstance(copy.children[0], ParentNode)
+        self.assertEqual(copy.children[-1].children[0].props, {"src": "/a.png", "alt": "alt"})
+
+    def test_empty_elements_round_trip(self):
+        tree = markdown_to_html_node("> \n\n```\n```")
+        self.assertEqual(unpack_html(pack_html(tree)).to_html(), tree.to_html())
+
+    def test_none_values_and_lazy_children(self):
+        tree = ParentNode("div", [
+            LazyParentNode("p", lambda: [LeafNode(None, "lazy")]),
+            LeafNode("img", None, {"src": "/x.png"}),
+            LeafNode("span", ""),
+        ], {"class": "page"})
+        copy = unpack_html(pack_html(tree))
+        self.assertEqual(copy.props, {"class": "page"})
+        self.assertEqual(copy.children[0].children[0].value, "lazy")
+        self.assertIsNone(copy.children[1].value)
+        self.assertEqual(copy.children[2].value, "")
+
+    def test_pickle_is_compact(self):
+        tree = markdown_to_html_node("\n\n".join(f"Paragraph **{i}** with [link](/p/{i})" for i in range(200)))
+        packed = pack_html(tree)
+        data = pickle.dumps(packed)
+        self.assertLess(len(data), len(pickle.dumps(tree)))
+        self.assertEqual(pickle.loads(data), packed)
+        self.assertEqual(unpack_html(pickle.loads(data)).to_html(), tree.to_html())
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            PackedNodes.from_bytes(b"XXXX" + bytes(13))
+        with self.assertRaises(ValueError):
+            unpack_html(pack_textnodes([TextNode("a", TextType.TEXT), TextNode("b", TextType.BOLD)]))
+
+    def test_truncated_data(self):
+        data = pack_html(markdown_to_html_node("# Title\n\nSome **bold** text")).to_bytes()
+        for size in (0, 5, len(data) // 2, len(data) - 1):
+            with self.assertRaisesRegex(ValueError, "Invalid packed node data"):
+                PackedNodes.from_bytes(data[:size])
+        with self.assertRaisesRegex(ValueError, "Invalid packed node data"):
+            PackedNodes.from_bytes(data + b"\0")
+
+    def test_malformed_records(self):
+        def packed(*records):
+            return PackedNodes(array("i", [field for record in records for field in record]), ["p", "href"], "text")
+
+        for records in (
+            # Name id outside the names table, either way.
+            [(KIND_PARENT, 2, 0, -1, NO_PARENT)],
+            [(KIND_PARENT, -2, 0, -1, NO_PARENT)],
+            # Parent that does not come before its child.
+            [(KIND_PARENT, 0, 0, -1, NO_PARENT), (KIND_LEAF, NO_TAG, 0, 4, 1)],
+            [(KIND_PARENT, 0, 0, -1, NO_PARENT), (KIND_LEAF, NO_TAG, 0, 4, -2)],
+            # A leaf used as a parent.
+            [(KIND_LEAF, 0, 0, 4, NO_PARENT), (KIND_LEAF, NO_TAG, 0, 4, 0)],
+            # An attribute with no owner, or owned by another attribute.
+            [(KIND_PARENT, 0, 0, -1, NO_PARENT), (KIND_ATTR, 1, 0, 4, NO_PARENT)],
+            [(KIND_PARENT, 0, 0, -1, NO_PARENT), (KIND_ATTR, 1, 0, 4, 0), (KIND_ATTR, 1, 0, 4, 1)],
+            # Unknown kind.
+            [(9, 0, 0, -1, NO_PARENT)],
+        ):
+            with self.assertRaises(ValueError, msg=records):
+                unpack_html(packed(*records))
+
+        valid = [(KIND_PARENT, 0, 0, -1, NO_PARENT), (KIND_ATTR, 1, 0, 4, 0), (KIND_LEAF, NO_TAG, 0, 4, 0)]
+        self.assertEqual(unpack_html(packed(*valid)).to_html(), '<p href="text">text</p>')
+
+
+if __name__ == "__main__":
+    unittest.main()
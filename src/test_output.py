@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from output import OutputWriter, write_if_changed
+
+
+class TestOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_if_changed(self):
+        path = os.path.join(self.tmp.name, "a", "index.html")
+        self.assertTrue(write_if_changed(path, b"<p>one</p>"))
+        stat = os.stat(path)
+        self.assertFalse(write_if_changed(path, b"<p>one</p>"))
+        self.assertEqual(os.stat(path).st_ino, stat.st_ino)
+        # Same size, different bytes.
+        self.assertTrue(write_if_changed(path, b"<p>two</p>"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"<p>two</p>")
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["index.html"])
+
+    def test_writer(self):
+        paths = [os.path.join(self.tmp.name, f"page{i}.html") for i in range(50)]
+        write_if_changed(paths[3], "page 3".encode("utf-8"))
+        stale = os.path.join(self.tmp.name, "old.html")
+        write_if_changed(stale, b"old")
+        with OutputWriter(workers=2) as writer:
+            for i, path in enumerate(paths):
+                writer.write(path, f"page {i}")
+            writer.remove(stale)
+            writer.remove(os.path.join(self.tmp.name, "missing.html"))
+        self.assertEqual(writer.written, paths[:3] + paths[4:])
+        self.assertEqual(writer.unchanged, [paths[3]])
+        self.assertEqual(writer.removed, [stale])
+        with open(paths[10]) as f:
+            self.assertEqual(f.read(), "page 10")
+
+    def test_writer_reports_errors(self):
+        blocker = os.path.join(self.tmp.name, "file")
+        write_if_changed(blocker, b"x")
+        writer = OutputWriter(workers=1)
+        writer.write(os.path.join(blocker, "page.html"), "text")
+        with self.assertRaises(OSError):
+            writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
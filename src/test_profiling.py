@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import block_markdown
+import profiling
+from build import build_site
+from htmlnode import ParentNode
+
+
+class TestProfiling(unittest.TestCase):
+    def tearDown(self):
+        profiling.disable()
+
+    def test_enable_disable_restores_functions(self):
+        original_classify = block_markdown.block_to_block_type
+        original_to_html = ParentNode.to_html
+        profiling.enable()
+        self.assertTrue(profiling.enabled())
+        self.assertIsNot(block_markdown.block_to_block_type, original_classify)
+        profiling.disable()
+        self.assertFalse(profiling.enabled())
+        self.assertIs(block_markdown.block_to_block_type, original_classify)
+        self.assertIs(ParentNode.to_html, original_to_html)
+
+    def test_page_profile(self):
+        profiling.enable()
+        profiling.begin_page("index.md")
+        html = block_markdown.markdown_to_html_node("# Title\n\nSome **bold** text").to_html()
+        stats = profiling.end_page()
+        self.assertEqual(stats["page"], "index.md")
+        self.assertEqual(stats["stages"]["blocks.classify"]["calls"], 2)
+        self.assertEqual(stats["stages"]["inline.parse"]["calls"], 1)
+        self.assertEqual(stats["counters"]["nodes.text"], 3)
+        self.assertEqual(stats["counters"]["html.bytes"], len(html))
+
+    def test_probes_are_silent_outside_a_page(self):
+        profiling.enable()
+        html = block_markdown.markdown_to_html_node("Some *text*").to_html()
+        self.assertEqual(html, "<div><p>Some <i>text</i></p></div>")
+
+    def test_build_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            os.makedirs(content)
+            for i in range(3):
+                with open(os.path.join(content, f"page{i}.md"), "w") as f:
+                    f.write(f"# Page {i}\n\n" + "Some **bold** text\n\n" * (i + 1))
+            report = build_site(content, os.path.join(tmp, "public"), workers=2, profile=True)
+            self.assertFalse(profiling.enabled())
+            self.assertEqual([page["page"] for page in report.profile], ["page0.md", "page1.md", "page2.md"])
+            self.assertEqual(report.profile[2]["counters"]["blocks"], 4)
+
+            path = os.path.join(tmp, "profile.json")
+            written = profiling.write_report(path, report.profile)
+            self.assertEqual(written["aggregate"]["pages"], 3)
+            self.assertEqual(written["aggregate"]["counters"]["blocks"], 9)
+            table = profiling.format_top_pages(report.profile, limit=2)
+            self.assertEqual(len(table.splitlines()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+
+from block_markdown import markdown_to_html_node, use_text_recorder
+from build import build_site
+from search_index import PageTerms, SearchIndex, decode_postings, shard_key
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_page_terms(self):
+        terms = PageTerms()
+        previous = use_text_recorder(terms)
+        try:
+            markdown_to_html_node(
+                "# Static Sites\n\nA **static** site with [a link](/x) and ![an image](/i.png)\n\n"
+                "```\ncode_is_skipped\n```\n\n## Static again"
+            )
+        finally:
+            use_text_recorder(previous)
+        self.assertEqual(terms.title, "Static Sites")
+        self.assertEqual(terms.terms["static"], 8 + 1 + 4)
+        self.assertEqual(terms.terms["sites"], 8)
+        self.assertEqual(terms.terms["link"], 1)
+        self.assertEqual(terms.terms["image"], 1)
+        self.assertNotIn("a", terms.terms)
+        self.assertNotIn("code_is_skipped", terms.terms)
+
+    def test_build_shards(self):
+        index = SearchIndex()
+        index.add("/b.html", {"title": "B", "terms": {"apple": 2, "zebra": 1}})
+        index.add("/a.html", {"title": None, "terms": {"apple": 1, "éclair": 3}})
+        pages, shards = index.build()
+        self.assertEqual(pages, [["/a.html", "/a.html"], ["/b.html", "B"]])
+        self.assertEqual(sorted(shards), ["_", "a", "z"])
+        self.assertEqual(decode_postings(shards["a"]["apple"]), [(0, 1), (1, 2)])
+        self.assertEqual(shards["_"], {"éclair": [0, 3]})
+        self.assertEqual(shard_key("42"), "4")
+
+
+class TestBuildSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        self.cache = os.path.join(self.tmp.name, "cache")
+        os.makedirs(os.path.join(self.content, "blog"))
+        self.write("index.md", "# Home\n\nWelcome to the **zebra** site")
+        self.write(os.path.join("blog", "post.md"), "# Zebra post\n\nStripes")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, page, markdown):
+        with open(os.path.join(self.content, page), "w") as f:
+            f.write(markdown)
+
+    def read(self, name):
+        with open(os.path.join(self.public, "search", name)) as f:
+            return json.load(f)
+
+    def build(self, workers=1):
+        return build_site(self.content, self.public, workers=workers, cache_dir=self.cache, search=True)
+
+    def test_index_is_written(self):
+        for workers in (2, 1):
+            self.build(workers)
+            meta = self.read("index.json")
+            self.assertEqual(meta["pages"], [["/blog/post.html", "Zebra post"], ["/index.html", "Home"]])
+            self.assertEqual(decode_postings(self.read("terms-z.json")["zebra"]), [(0, 8), (1, 1)])
+            self.assertIn("s", meta["shards"])
+
+    def test_incremental_build_keeps_terms(self):
+        self.build()
+        self.write("index.md", "# Home\n\nNothing here")
+        report = self.build()
+        self.assertEqual(len(report.skipped), 1)
+        self.assertEqual(decode_postings(self.read("terms-z.json")["zebra"]), [(0, 8)])
+        self.assertNotIn("welcome", self.read("terms-w.json") if os.path.exists(
+            os.path.join(self.public, "search", "terms-w.json")) else {})
+        self.assertIn(os.path.join(self.public, "search", "terms-w.json"), report.search["removed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
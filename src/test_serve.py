@@ -0,0 +1,162 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+from block_markdown import use_asset_urls
+from build import build_site, use_template
+from serve import LiveReload, Watcher, RELOAD_PATH, make_server
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.content, "docs"))
+        os.makedirs(self.public)
+        self.write("index.md", "# Home")
+        self.write(os.path.join("docs", "a.md"), "# A")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, page, markdown):
+        path = os.path.join(self.content, page)
+        with open(path, "w") as f:
+            f.write(markdown)
+        stat = os.stat(path)
+        # Make sure the edit is visible even on filesystems with coarse mtimes.
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_poll_and_rebuild(self):
+        reload = LiveReload()
+        watcher = Watcher(self.content, self.public, reload)
+        self.assertEqual(watcher.poll(), ([], []))
+
+        self.write(os.path.join("docs", "a.md"), "# A changed")
+        self.write("new.md", "# New")
+        changed, deleted = watcher.poll()
+        self.assertEqual(changed, [os.path.join("docs", "a.md"), "new.md"])
+        self.assertEqual(deleted, [])
+        self.assertEqual(watcher.rebuild(changed, deleted), changed)
+        with open(os.path.join(self.public, "docs", "a.html")) as f:
+            self.assertIn("<h1>A changed</h1>", f.read())
+        self.assertEqual(reload.version, 1)
+
+        os.remove(os.path.join(self.content, "new.md"))
+        changed, deleted = watcher.poll()
+        self.assertEqual((changed, deleted), ([], ["new.md"]))
+        watcher.rebuild(changed, deleted)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "new.html")))
+
+    def test_rebuild_reports_failed_pages(self):
+        watcher = Watcher(self.content, self.public)
+        with open(os.path.join(self.content, "bad.md"), "wb") as f:
+            f.write(b"# \xff")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            rendered = watcher.rebuild(["bad.md", "index.md"], [])
+        self.assertEqual(rendered, ["index.md"])
+        self.assertIn("error: bad.md:", output.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.public, "bad.html")))
+
+    def test_template_change_rebuilds_every_page(self):
+        layout = os.path.join(self.tmp.name, "layout.html")
+        with open(layout, "w") as f:
+            f.write("<old>{{ Content }}")
+        self.addCleanup(use_template, None)
+        watcher = Watcher(self.content, self.public, template_path=layout)
+        self.assertFalse(watcher.template_changed())
+        with open(layout, "w") as f:
+            f.write("<new>{{ Content }}")
+        stat = os.stat(layout)
+        os.utime(layout, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertTrue(watcher.template_changed())
+        watcher.rebuild(sorted(watcher.snapshot), [])
+        with open(os.path.join(self.public, "index.html")) as f:
+            self.assertTrue(f.read().startswith("<new>"))
+
+    def test_hashed_assets(self):
+        static = os.path.join(self.tmp.name, "static")
+        os.makedirs(static)
+        with open(os.path.join(static, "style.css"), "w") as f:
+            f.write("body {}")
+        self.write("index.md", "# Home\n\n![logo](/style.css)")
+        cache = os.path.join(self.tmp.name, "cache")
+        report = build_site(
+            self.content, self.public, workers=1, cache_dir=cache, static_dir=static, hash_assets=True
+        )
+        self.addCleanup(use_template, None)
+        self.addCleanup(use_asset_urls, None)
+        watcher = Watcher(
+            self.content,
+            self.public,
+            static_dir=static,
+            hash_assets=True,
+            cache_dir=cache,
+            asset_urls=report.assets.urls(),
+        )
+
+        def index():
+            with open(os.path.join(self.public, "index.html")) as f:
+                return f.read()
+
+        (old_url,) = report.assets.urls().values()
+        watcher.rebuild(["index.md"], [])
+        self.assertEqual(index().count(f'"{old_url}"'), 2)
+        self.assertEqual(watcher.static_changed(), (False, False))
+
+        with open(os.path.join(static, "style.css"), "w") as f:
+            f.write("body { color: red }")
+        self.assertEqual(watcher.static_changed(), (True, True))
+        watcher.rebuild(["index.md"], [])
+        (new_url,) = watcher.asset_urls.values()
+        self.assertNotEqual(new_url, old_url)
+        self.assertEqual(index().count(f'"{new_url}"'), 2)
+        self.assertTrue(os.path.exists(self.public + new_url))
+        self.assertFalse(os.path.exists(self.public + old_url))
+
+    def test_poll_pages(self):
+        watcher = Watcher(self.content, self.public)
+        self.assertEqual(watcher.poll_pages(["index.md"]), ([], []))
+        self.write("index.md", "# Home again")
+        os.remove(os.path.join(self.content, "docs", "a.md"))
+        changed, deleted = watcher.poll_pages(["index.md", os.path.join("docs", "a.md")])
+        self.assertEqual(changed, ["index.md"])
+        self.assertEqual(deleted, [os.path.join("docs", "a.md")])
+        self.assertEqual(watcher.poll(), ([], []))
+
+    def test_server_injects_reload_script(self):
+        with open(os.path.join(self.public, "index.html"), "w") as f:
+            f.write("<html><body><p>hi</p></body></html>")
+        reload = LiveReload()
+        server = make_server(self.public, port=0, reload=reload, quiet=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(base + "/") as response:
+                html = response.read().decode("utf-8")
+            self.assertIn(RELOAD_PATH, html)
+            self.assertTrue(html.endswith("</script>\n</body></html>"))
+
+            reload.bump()
+            with urllib.request.urlopen(base + RELOAD_PATH + "?since=0") as response:
+                self.assertEqual(response.read(), b"1")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_live_reload_wait(self):
+        reload = LiveReload()
+        self.assertEqual(reload.wait(0, timeout=0.01), 0)
+        threading.Timer(0.01, reload.bump).start()
+        self.assertEqual(reload.wait(0, timeout=5), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+
+from build import build_site, config_hash, render_markdown, use_template, DEFAULT_TEMPLATE
+from template import compile_template, load_template
+
+
+class TestTemplate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        return path
+
+    def test_compile_and_render(self):
+        template = compile_template("<title>{{ Title }}</title><main>{{Content}}</main>{{ Title }}")
+        self.assertEqual(
+            template.parts,
+            ["<title>", None, "</title><main>", None, "</main>", None, ""],
+        )
+        self.assertEqual(template.names(), ["Content", "Title"])
+        self.assertEqual(
+            template.render({"Title": "T", "Content": "<p>x</p>"}),
+            "<title>T</title><main><p>x</p></main>T",
+        )
+
+    def test_missing_value(self):
+        with self.assertRaises(ValueError):
+            compile_template("{{ Title }}").render({})
+
+    def test_partials(self):
+        os.makedirs(os.path.join(self.tmp.name, "partials"))
+        self.write(os.path.join("partials", "nav.html"), "<nav>{{ Title }}</nav>")
+        self.write(os.path.join("partials", "header.html"), "<header>{{> nav.html }}</header>")
+        path = self.write("layout.html", "{{> partials/header.html }}{{ Content }}")
+        template = load_template(path)
+        self.assertEqual(template.text, "<header><nav>{{ Title }}</nav></header>{{ Content }}")
+        self.assertEqual(template.render({"Title": "A", "Content": "B"}), "<header><nav>A</nav></header>B")
+        self.assertEqual(len(template.stamps), 3)
+
+    def test_recursive_partial(self):
+        self.write("loop.html", "{{> loop.html }}")
+        path = self.write("layout.html", "{{> loop.html }}")
+        with self.assertRaises(ValueError):
+            load_template(path)
+
+    def test_recursive_partial_through_other_path(self):
+        directory = os.path.basename(self.tmp.name)
+        self.write("a.html", f"<a>{{{{> ../{directory}/a.html }}}}")
+        path = self.write("layout.html", "{{> a.html }}")
+        with self.assertRaisesRegex(ValueError, "includes itself"):
+            load_template(path)
+
+    def test_cached_until_changed(self):
+        self.write("footer.html", "<footer>1</footer>")
+        path = self.write("layout.html", "{{ Content }}{{> footer.html }}")
+        template = load_template(path)
+        self.assertIs(load_template(path), template)
+        self.write("footer.html", "<footer>2</footer>")
+        self.assertTrue(template.is_stale())
+        reloaded = load_template(path)
+        self.assertIsNot(reloaded, template)
+        self.assertEqual(reloaded.render({"Content": ""}), "<footer>2</footer>")
+
+    def test_render_uses_active_template(self):
+        previous = use_template(compile_template("[{{ Title }}]{{ Content }}"))
+        try:
+            self.assertEqual(render_markdown("# A & B", "page"), "[A &amp; B]<div><h1>A &amp; B</h1></div>")
+        finally:
+            use_template(previous)
+        self.assertIs(use_template(None), DEFAULT_TEMPLATE)
+
+    def test_build_with_template(self):
+        content = os.path.join(self.tmp.name, "content")
+        public = os.path.join(self.tmp.name, "public")
+        cache = os.path.join(self.tmp.name, "cache")
+        os.makedirs(content)
+        with open(os.path.join(content, "index.md"), "w") as f:
+            f.write("# Home\n\nWelcome")
+        path = self.write("layout.html", "<h>{{ Title }}</h>{{ Content }}")
+        for workers in (1, 2):
+            build_site(content, public, workers=workers, template_path=path)
+            with open(os.path.join(public, "index.html")) as f:
+                self.assertEqual(f.read(), "<h>Home</h><div><h1>Home</h1><p>Welcome</p></div>")
+
+        report = build_site(content, public, cache_dir=cache, template_path=path)
+        self.assertEqual(len(report.unchanged), 1)
+        report = build_site(content, public, cache_dir=cache, template_path=path)
+        self.assertEqual(len(report.skipped), 1)
+        self.write("layout.html", "<h>{{ Title }}</h><main>{{ Content }}</main>")
+        self.assertNotEqual(config_hash(load_template(path)), config_hash())
+        self.assertEqual(len(build_site(content, public, cache_dir=cache, template_path=path).written), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()